@@ -11,6 +11,44 @@ class APMConfig(BaseSettings):
     service_name: str = Field("SEARCH APM")
 
 
+class CacheConfig(BaseSettings):
+    # In-process cache kept by each worker in front of Redis
+    memory_max_entries: int = Field(default=1000)
+    memory_max_size: int = Field(default=50_000_000)  # bytes of serialized values
+    memory_max_time_to_live: int = Field(default=3600)  # seconds
+    # Cross-worker coalescing of cache misses, in-process coalescing is always on
+    lock_enabled: bool = Field(default=False)
+    lock_lease: int = Field(default=5000)  # milliseconds
+    lock_poll_interval: int = Field(default=50)  # milliseconds
+    # How long slow searches are served stale while being refreshed
+    stale_time_to_live: int = Field(default=7200)  # seconds
+    # Compression of cached values : "zlib", "zstd" (if installed) or "none"
+    compression: str = Field(default="zlib")
+    compression_threshold: int = Field(default=16_384)  # bytes
+    # Second tier caching the serialized API responses of cached searches, for
+    # at most the time to live of their search results
+    response_cache_enabled: bool = Field(default=True)
+    response_time_to_live: int = Field(default=600)  # seconds
+
+
+class CachePolicyConfig(BaseSettings):
+    # Searches slower than this (ms) are cached, then served stale
+    slow_search_time: int = Field(default=400)
+    slow_search_time_to_live: int = Field(default=86400)  # seconds
+    lookup_time_to_live: int = Field(default=1800)  # seconds, for SIREN/SIRET
+    # Faster searches are cached according to the Elasticsearch time (ms) they
+    # would have saved, i.e. execution time * number of recent requests
+    popular_min_saved_time: int = Field(default=1000)
+    popular_time_to_live: int = Field(default=600)  # seconds
+    hot_min_saved_time: int = Field(default=20_000)
+    hot_time_to_live: int = Field(default=3600)  # seconds
+    max_payload_size: int = Field(default=1_000_000)  # bytes of serialized results
+    # Count-min sketch estimating the number of recent requests of a search
+    sketch_width: int = Field(default=4096)
+    sketch_depth: int = Field(default=4)
+    sketch_window: int = Field(default=100_000)  # requests between agings
+
+
 class DocsConfig(BaseSettings):
     doc_path: Path = Field(
         default_factory=lambda: Path(__file__).parent / "doc" / "open-api.yml"
@@ -33,16 +71,35 @@ class RedisConfig(BaseSettings):
     host: str = Field(default="redis")
     port: str = Field(default="6379")
     database: str = Field(default="0")
+    max_connections: int = Field(default=50)  # per worker
+    connect_timeout: float = Field(default=0.2)  # seconds
+    # For reads, and to wait for a connection when the pool is exhausted
+    timeout: float = Field(default=0.2)  # seconds
+    # Redis is skipped for `cool_down` seconds after consecutive failures
+    circuit_breaker_failures: int = Field(default=5)
+    circuit_breaker_cool_down: float = Field(default=30)  # seconds
 
 
 class MatomoConfig(BaseSettings):
     id_site: str = Field(...)
     tracking_url: AnyHttpUrl = Field(...)
+    # Events are queued, then sent in bulk requests by a background task
+    max_queue_size: int = Field(default=10_000)  # oldest events are dropped
+    bulk_max_size: int = Field(default=100)  # events per request
+    flush_interval: float = Field(default=5)  # seconds
+    timeout: float = Field(default=5)  # seconds
 
 
 class MetadataConfig(BaseSettings):
     url_cc_json: AnyHttpUrl = Field(...)
     url_updates_json: AnyHttpUrl = Field(...)
+    connect_timeout: float = Field(default=2)  # seconds
+    timeout: float = Field(default=10)  # seconds, for reads, writes and the pool
+    # The metadata files are refreshed in the background by each worker
+    refresh_interval: float = Field(default=3600)  # seconds
+    # A worker without a metadata file waits this long after a failed fetch
+    # before fetching it again, requests failing meanwhile
+    retry_interval: float = Field(default=30)  # seconds
 
 
 class SentryConfig(BaseSettings):
@@ -65,6 +122,8 @@ class Settings(BaseSettings):
     )
 
     apm: APMConfig = Field(...)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    cache_policy: CachePolicyConfig = Field(default_factory=CachePolicyConfig)
     elastic: ElasticConfig = Field(...)
     env: str = Field(...)
     matomo: MatomoConfig = Field(...)
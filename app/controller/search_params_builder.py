@@ -23,7 +23,10 @@ class SearchParamsBuilder:
     @staticmethod
     def map_request_parameters(request):
         # Extract all query parameters from the request
-        request_params = request.query_params
+        return SearchParamsBuilder.map_parameters(request.query_params)
+
+    @staticmethod
+    def map_parameters(request_params):
         mapped_params = {}
         for param, param_value in request_params.items():
             field_should_be_mapped = param in SearchParamsBuilder.PARAMETER_MAPPING
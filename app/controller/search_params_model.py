@@ -1,7 +1,8 @@
 import re
 from datetime import date
+from types import MappingProxyType
 
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, PrivateAttr, field_validator, model_validator
 
 from app.controller.field_validation import (
     FIELD_LENGTHS,
@@ -10,6 +11,7 @@ from app.controller.field_validation import (
     VALID_FIELD_VALUES,
     VALID_FIELDS_TO_SELECT,
 )
+from app.elastic.helpers.cursor import decode_cursor
 from app.exceptions.exceptions import (
     InvalidParamError,
 )
@@ -77,6 +79,11 @@ class SearchParams(BaseModel):
     include: list | None = None
     include_admin: list | None = None
     sort_by_size: bool | None = None
+    cursor: str | None = None
+
+    # Read-only view of the parameters which are not None, built once the
+    # parameters are validated, see `active_params`
+    _active_params: MappingProxyType = PrivateAttr(default=None)
 
     # Field Validators (involve one field at a time)
     @field_validator(
@@ -285,6 +292,11 @@ class SearchParams(BaseModel):
                 )
         return list_fields
 
+    @field_validator("cursor", mode="after")
+    def check_cursor_is_valid(cls, cursor: str) -> str:
+        decode_cursor(cursor)
+        return cursor
+
     # Model Validators (involve more than one field at a time)
     @model_validator(mode="after")
     def total_results_should_be_smaller_than_10000(self):
@@ -300,6 +312,15 @@ class SearchParams(BaseModel):
             )
         return self
 
+    @model_validator(mode="after")
+    def cursor_should_not_be_used_with_page(self):
+        if self.cursor and self.page != 1:
+            raise InvalidParamError(
+                "Les paramètres `cursor` et `page` ne peuvent pas être utilisés "
+                "ensemble."
+            )
+        return self
+
     @model_validator(mode="after")
     def validate_date_range(self):
         min_date_naiss = self.min_date_naiss_personne
@@ -340,6 +361,7 @@ class SearchParams(BaseModel):
             "include",
             "include_admin",
             "sort_by_size",
+            "cursor",
         ]
 
         all_fields_are_null_except_excluded = check_params_are_none_except_excluded(
@@ -367,6 +389,7 @@ class SearchParams(BaseModel):
             "include",
             "include_admin",
             "sort_by_size",
+            "cursor",
         ]
 
         all_fields_are_null_except_excluded = check_params_are_none_except_excluded(
@@ -392,3 +415,23 @@ class SearchParams(BaseModel):
                 "Veuillez indiquer une longitude entre -180° et 180°."
             )
         return self
+
+    @model_validator(mode="after")
+    def build_active_params(self):
+        self._active_params = MappingProxyType(
+            {
+                field_name: getattr(self, field_name)
+                for field_name in self.model_fields
+                if getattr(self, field_name) is not None
+            }
+        )
+        return self
+
+    @property
+    def active_params(self) -> MappingProxyType:
+        """Parameters which are not None, in the order of the model fields.
+
+        Query builders read it rather than dumping the model with `.dict()`
+        every time they look for the parameters they handle.
+        """
+        return self._active_params
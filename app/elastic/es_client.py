@@ -0,0 +1,112 @@
+import logging
+from functools import lru_cache
+
+from elasticsearch import AsyncElasticsearch, TransportError
+from elasticsearch_dsl import MultiSearch
+
+from app.config import settings
+
+
+@lru_cache
+def get_es_client() -> AsyncElasticsearch:
+    """Process-wide async Elasticsearch client, created on first use."""
+    return AsyncElasticsearch(
+        hosts=[str(settings.elastic.url)],
+        http_auth=(
+            settings.elastic.user,
+            settings.elastic.password.get_secret_value(),
+        ),
+        retry_on_timeout=True,
+    )
+
+
+async def execute_search(search, raw=False):
+    """Async equivalent of `elasticsearch_dsl.Search.execute()`.
+
+    `elasticsearch_dsl` is only used to build the query, the request itself is
+    sent with the async client so it does not block the event loop. With `raw`,
+    the response body is returned as is, rather than wrapped in a `Response`
+    whose hits are converted to `AttrDict` when read.
+    """
+    es_client = get_es_client()
+    raw_response = await es_client.search(
+        index=search._index, body=search.to_dict(), **search._params
+    )
+    if raw:
+        return raw_response
+    return search._response_class(search, raw_response)
+
+
+async def execute_multi_search(searches, raise_on_error=True, raw=False):
+    """Send several searches in a single `_msearch` round-trip.
+
+    Returns one `Response` per search (or its body, with `raw`), in the same
+    order. Like `elasticsearch_dsl.MultiSearch.execute()`, raises if any search
+    failed, unless `raise_on_error` is False : the error is then returned in
+    place of the failed search response.
+    """
+    multi_search = MultiSearch()
+    for search in searches:
+        multi_search = multi_search.add(search)
+    es_client = get_es_client()
+    raw_responses = await es_client.msearch(body=multi_search.to_dict())
+    responses = []
+    for search, raw_response in zip(searches, raw_responses["responses"]):
+        if raw_response.get("error", False):
+            error = TransportError(
+                "N/A", raw_response["error"]["type"], raw_response["error"]
+            )
+            if raise_on_error:
+                raise error
+            responses.append(error)
+            continue
+        if raw:
+            responses.append(raw_response)
+        else:
+            responses.append(search._response_class(search, raw_response))
+    return responses
+
+
+async def close_es_client():
+    await get_es_client().close()
+
+
+async def iterate_search_pages(search, sort, page_size, keep_alive="1m", raw=False):
+    """Iterate over all the hits of a search, one `Response` (or its body, with
+    `raw`) per page.
+
+    Pages are fetched with `search_after` over a point in time : unlike paging
+    with from/size, this is not limited to 10 000 hits, each page costs the
+    same, and the results are consistent even if the index is updated. The
+    next page is only fetched when the caller asks for it. `sort` must end with
+    a field uniquely identifying hits, or with a unique enough tiebreaker.
+    """
+    es_client = get_es_client()
+    point_in_time = await es_client.open_point_in_time(
+        index=search._index, keep_alive=keep_alive
+    )
+    point_in_time_id = point_in_time["id"]
+    search = search.extra(size=page_size, track_total_hits=False).sort(*sort)
+    search_after = None
+    try:
+        while True:
+            body = search.to_dict()
+            body["pit"] = {"id": point_in_time_id, "keep_alive": keep_alive}
+            if search_after is not None:
+                body["search_after"] = search_after
+            raw_response = await es_client.search(body=body)
+            hits = raw_response["hits"]["hits"]
+            if hits and raw:
+                yield raw_response
+            elif hits:
+                yield search._response_class(search, raw_response)
+            if len(hits) < page_size:
+                return
+            point_in_time_id = raw_response.get("pit_id", point_in_time_id)
+            search_after = hits[-1]["sort"]
+    finally:
+        try:
+            await es_client.close_point_in_time(body={"id": point_in_time_id})
+        except Exception as error:
+            # The point in time expires after `keep_alive` anyway
+            logging.info(f"Error while closing point in time: {error}")
@@ -1,36 +1,57 @@
 import logging
+import time
 from datetime import timedelta
 
+from app.elastic.es_client import execute_multi_search, execute_search
 from app.elastic.es_index import StructureMapping
 from app.elastic.geo_search import build_es_search_geo_query
+from app.elastic.helpers.cursor import CursorPage
 from app.elastic.helpers.helpers import (
-    execute_and_agg_total_results_by_identifiant,
-    extract_ul_and_etab_from_es_response,
+    build_total_results_by_identifiant_search,
+    collapse_by_identifiant,
+    extract_ul_and_etab_from_hit,
     page_through_results,
+    page_through_results_after_cursor,
 )
 from app.elastic.parsers.siren import is_siren
 from app.elastic.parsers.siret import is_siret
 from app.elastic.text_search import build_es_search_text_query
 from app.service.search_type import SearchType
-from app.utils.cache import cache_strategy
+from app.utils.cache import build_search_cache_key, cache_strategy
+from app.utils.cache_policy import get_search_time_to_live
 from app.utils.helpers import is_dev_env
 
-MIN_EXECUTION_TIME = 400
 MAX_TOTAL_RESULTS = 10000
+# Hits fetched per page of results when paginating with cursors, as the
+# documents of large structures are deduplicated after the search
+CURSOR_FETCH_FACTOR = 2
+# Hits fetched at most when the first ones did not fill the page, the number
+# of hits being doubled at each fetch
+CURSOR_MAX_FETCH_SIZE = 1000
 
 
 class ElasticSearchRunner:
-    def __init__(self, search_params=None, search_type=None):
+    def __init__(self, search_params=None, search_type=None, requests=0):
         self.es_search_client = StructureMapping.search()
+        self.es_count_search_client = None
         self.es_index = StructureMapping.Index.name
         self.search_type = search_type
         self.search_params = search_params
         self.has_full_text_query = False
+        # SIREN/SIRET lookups match a handful of documents : they are neither
+        # scored nor sorted, and do not need a distinct results count
+        self.is_identifier_lookup = False
         self.es_search_results = None
         self.total_results = None
         self.execution_time = None
-        if search_type:
-            self.run()
+        # Cursor of the next page, when paginating with cursors
+        self.cursor = None
+        self.cursor_page = None
+        # Estimated number of recent requests for the same search, counted
+        # before any cache lookup
+        self.requests = requests
+        # Timestamp after which the search results are stale, see `CacheEntry`
+        self.fresh_until = None
 
     def sort_es_search_query(self):
         # Sorting is very heavy on performance if there are no
@@ -38,40 +59,145 @@ class ElasticSearchRunner:
         # exclude this sorting because score is the same for all results
         # documents. Beware, nom and prenoms are search fields.
         if self.has_full_text_query:
-            self.es_search_client = self.es_search_client.sort(
+            sort = [
                 {"_score": {"order": "desc"}},
                 {"unite_legale.etat_administratif_unite_legale": {"order": "asc"}},
                 {"unite_legale.nombre_etablissements_ouverts": {"order": "desc"}},
-            )
+            ]
         # If only filters are used, use nombre établissements ouverts to sort the
         # results
         else:
-            self.es_search_client = self.es_search_client.sort(
+            sort = [
                 {"unite_legale.nombre_etablissements_ouverts": {"order": "desc"}},
+            ]
+        # Cursors hold the sort values of the last hit, which must identify it
+        if self.search_params.cursor:
+            sort.append({"identifiant": {"order": "asc"}})
+        self.es_search_client = self.es_search_client.sort(*sort)
+
+    def get_es_searches(self):
+        """Searches sent in a single `_msearch` : the page of hits, and the
+        distinct results count unless the search is an identifier lookup."""
+        if self.is_identifier_lookup:
+            return [self.es_search_client]
+        return [self.es_search_client, self.es_count_search_client]
+
+    async def execute_and_format_es_search(self):
+        if self.is_identifier_lookup:
+            es_response = await execute_search(self.es_search_client, raw=True)
+            self.format_es_search_responses(es_response)
+        else:
+            es_response, es_count_response = await execute_multi_search(
+                self.get_es_searches(), raw=True
+            )
+            self.format_es_search_responses(es_response, es_count_response)
+            await self.complete_cursor_page()
+        return self.get_results_to_cache()
+
+    def format_es_search_responses(self, es_response, es_count_response=None):
+        """Format the raw bodies of the hits search and of the count search."""
+        if es_count_response is None:
+            # A single structure matches an identifier, whose documents are
+            # collapsed
+            self.format_identifier_lookup_results(
+                [
+                    extract_ul_and_etab_from_hit(matching_structure)
+                    for matching_structure in es_response["hits"]["hits"]
+                ],
+                total_results=min(es_response["hits"]["total"]["value"], 1),
+                execution_time=es_response["took"],
             )
+            return
 
-    def execute_and_format_es_search(self):
-        self.es_search_client = page_through_results(self)
-        es_response = self.es_search_client.execute()
-        self.total_results = es_response.hits.total.value
-        self.execution_time = es_response.took
+        self.total_results = es_response["hits"]["total"]["value"]
+        self.execution_time = max(es_response["took"], es_count_response["took"])
 
         # Due to performance issues when aggregating on filter queries, we use
         # aggregation on total_results only when total_results is lower than
         # 10 000 results. If total_results is higher than 10 000 results,
-        # the aggregation causes timeouts on API. We return by default 10 000 results.
+        # we return by default 10 000 results.
         max_results_exceeded = self.total_results >= MAX_TOTAL_RESULTS
         if not max_results_exceeded:
-            execute_and_agg_total_results_by_identifiant(self)
+            self.total_results = es_count_response["aggregations"]["by_cluster"][
+                "value"
+            ]
+
+        self.es_search_results = [
+            extract_ul_and_etab_from_hit(matching_structure)
+            for matching_structure in es_response["hits"]["hits"]
+        ]
+
+        if self.search_params.cursor:
+            self.cursor_page = CursorPage(
+                self.search_params.cursor, self.search_params.per_page
+            )
+            self.add_cursor_page_hits(
+                self.es_search_results,
+                CURSOR_FETCH_FACTOR * self.search_params.per_page,
+            )
 
-        self.es_search_results = []
-        for matching_structure in es_response.hits:
-            matching_structure_dict = extract_ul_and_etab_from_es_response(
-                matching_structure
+    def add_cursor_page_hits(self, structures, size):
+        self.cursor_page.add_hits(structures, size)
+        self.es_search_results = self.cursor_page.structures
+        self.cursor = self.cursor_page.next_cursor
+
+    async def complete_cursor_page(self):
+        """Fetch more hits until the cursor page holds `per_page` structures or
+        no hits are left, see `CursorPage`."""
+        size = CURSOR_FETCH_FACTOR * self.search_params.per_page
+        while self.cursor_page is not None and not self.cursor_page.is_complete:
+            size = min(2 * size, CURSOR_MAX_FETCH_SIZE)
+            es_search = self.es_search_client.extra(
+                search_after=self.cursor_page.search_after
+            )[0:size]
+            es_response = await execute_search(es_search, raw=True)
+            self.execution_time += es_response["took"]
+            self.add_cursor_page_hits(
+                [
+                    extract_ul_and_etab_from_hit(matching_structure)
+                    for matching_structure in es_response["hits"]["hits"]
+                ],
+                size,
             )
-            self.es_search_results.append(matching_structure_dict)
 
-    def sort_and_execute_es_search_query(self):
+    def format_identifier_lookup_results(
+        self, structures, total_results, execution_time
+    ):
+        self.es_search_results = structures
+        self.total_results = total_results
+        self.execution_time = execution_time
+
+    def get_results_to_cache(self):
+        return {
+            "total_results": self.total_results,
+            "response": self.es_search_results,
+            "execution_time": self.execution_time,
+            "cursor": self.cursor,
+        }
+
+    def set_results_from_cache(self, cached_search_results):
+        self.total_results = cached_search_results["total_results"]
+        self.es_search_results = cached_search_results["response"]
+        self.execution_time = cached_search_results["execution_time"]
+        self.cursor = cached_search_results.get("cursor")
+
+    def build_es_search_query(self):
+        if self.search_type == SearchType.TEXT:
+            build_es_search_text_query(self)
+        elif self.search_type == SearchType.GEO:
+            build_es_search_geo_query(self)
+
+        if self.is_identifier_lookup:
+            self.es_search_client = collapse_by_identifiant(self.es_search_client)
+            self.es_search_client = page_through_results(self)
+            return
+
+        # The distinct results count only depends on the query, it is built
+        # before sorting, collapsing and paging the hits search
+        self.es_count_search_client = build_total_results_by_identifiant_search(
+            self.es_search_client, MAX_TOTAL_RESULTS
+        )
+
         self.es_search_client = self.es_search_client.extra(track_scores=True)
 
         # explain query result in dev env
@@ -80,58 +206,52 @@ class ElasticSearchRunner:
                 track_scores=True, explain=True
             )
 
-        # Collapse is used to aggregate the results by siren. It is the consequence
-        # of separating large documents into smaller ones
-        self.es_search_client = self.es_search_client.update_from_dict(
-            {"collapse": {"field": "identifiant"}}
-        )
-
         # Sort results
         self.sort_es_search_query()
 
+        if self.search_params.cursor:
+            self.es_search_client = page_through_results_after_cursor(
+                self, CURSOR_FETCH_FACTOR * self.search_params.per_page
+            )
+        else:
+            self.es_search_client = collapse_by_identifiant(self.es_search_client)
+            self.es_search_client = page_through_results(self)
+
+    def get_cache_key(self):
+        # Search parameters include the page and page size
+        return build_search_cache_key(self.search_type, self.search_params)
+
+    async def execute_es_search_query(self):
         # Execute search, only called if key not found in cache
-        # (see cache strategy below)
-        def get_es_search_response():
-            self.execute_and_format_es_search()
-            es_results_to_cache = {
-                "total_results": self.total_results,
-                "response": self.es_search_results,
-                "execution_time": self.execution_time,
-            }
-            return es_results_to_cache
-
-        # To make sure the page and page size are part of the cache key
-        cache_key = page_through_results(self)
-
-        cached_search_results = cache_strategy(
-            cache_key,
-            get_es_search_response,
+        cache_entry = await cache_strategy(
+            self.get_cache_key(),
+            self.execute_and_format_es_search,
             self.should_cache_for_how_long,
         )
+        self.set_results_from_cache(cache_entry.value)
+        self.fresh_until = cache_entry.fresh_until
 
-        self.total_results = cached_search_results["total_results"]
-        self.es_search_results = cached_search_results["response"]
-        self.execution_time = cached_search_results["execution_time"]
+    def get_remaining_freshness(self) -> timedelta:
+        """Time left before the search results are stale, zero if they already
+        are or if it is unknown."""
+        if self.fresh_until is None:
+            return timedelta(0)
+        return max(timedelta(seconds=self.fresh_until - time.time()), timedelta(0))
 
     def should_cache_for_how_long(self):
-        """Determines how long to cache search results based on conditions:
-        - 24 hours if execution time > MIN_EXECUTION_TIME
-        - 30 minutes if searching by SIREN/SIRET
-        - No caching (0 minutes) otherwise or on error"""
+        """Determines how long to cache search results, see
+        `get_search_time_to_live`. No caching (0 minutes) on error."""
         try:
             query_terms = self.search_params.terms
-            if self.execution_time > MIN_EXECUTION_TIME:
-                return timedelta(hours=24)
-            if is_siren(query_terms) or is_siret(query_terms):
-                return timedelta(minutes=30)
-            return timedelta(minutes=0)  # Default case when no conditions are met
+            return get_search_time_to_live(
+                self.execution_time,
+                self.requests,
+                is_lookup=is_siren(query_terms) or is_siret(query_terms),
+            )
         except KeyError as error:
             logging.info(f"Error getting search execution time: {error}")
             return timedelta(minutes=0)
 
-    def run(self):
-        if self.search_type == SearchType.TEXT:
-            build_es_search_text_query(self)
-        elif self.search_type == SearchType.GEO:
-            build_es_search_geo_query(self)
-        self.sort_and_execute_es_search_query()
+    async def run(self):
+        self.build_es_search_query()
+        await self.execute_es_search_query()
@@ -8,7 +8,7 @@ def filter_search_by_bool_fields_unite_legale(
     search_params,
     filters_to_include: list,
 ):
-    for param_name, param_value in search_params.dict().items():
+    for param_name, param_value in search_params.active_params.items():
         should_apply_bool_filter = (
             param_value is not None and param_name in filters_to_include
         )
@@ -39,7 +39,7 @@ def filter_search_by_bool_fields_unite_legale(
 def filter_search_by_bool_nested_fields_unite_legale(
     search, search_params, filters_to_include: list, path
 ):
-    for param_name, param_value in search_params.dict().items():
+    for param_name, param_value in search_params.active_params.items():
         should_apply_bool_filter = (
             param_value is not None and param_name in filters_to_include
         )
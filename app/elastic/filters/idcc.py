@@ -0,0 +1,20 @@
+from elasticsearch_dsl import Q
+
+
+def filter_by_idcc(search, idcc):
+    """Filter the structures with at least one établissement under the
+    convention collective of identifier `idcc`, in filter context (no scoring).
+    """
+    idcc_filter = {
+        "nested": {
+            "path": "unite_legale.etablissements",
+            "query": {
+                "bool": {
+                    "filter": [
+                        {"match": {"unite_legale.etablissements.liste_idcc": idcc}}
+                    ]
+                }
+            },
+        }
+    }
+    return search.filter(Q(idcc_filter))
@@ -1,4 +1,9 @@
 def filter_by_siren(search, siren_string):
     """Filter by `siren` number"""
-    search = search.filter("term", **{"unite_legale.siren": siren_string})
+    return filter_by_sirens(search, [siren_string])
+
+
+def filter_by_sirens(search, sirens):
+    """Filter by a list of `siren` numbers, in filter context (no scoring)"""
+    search = search.filter("terms", **{"unite_legale.siren": sirens})
     return search
@@ -1,20 +1,34 @@
 from elasticsearch_dsl import Q
 
+from app.elastic.filters.siren import filter_by_sirens
+
+# Default value of the `index.max_inner_result_window` index setting
+MAX_INNER_HITS = 100
+
 
 def filter_by_siret(search, siret_string):
     """Filter by 'siret' number"""
+    return filter_by_sirets(search, [siret_string])
+
+
+def filter_by_sirets(search, sirets):
+    """Filter by a list of 'siret' numbers, in filter context (no scoring).
+
+    The matching établissements are returned as inner hits. Documents are
+    first filtered by siren (the first 9 digits of a siret), which is much
+    cheaper than the nested query.
+    """
+    search = filter_by_sirens(search, sorted({siret[:9] for siret in sirets}))
     siret_filter = {
         "nested": {
             "path": "unite_legale.etablissements",
             "query": {
                 "bool": {
-                    "filter": [
-                        {"term": {"unite_legale.etablissements.siret": siret_string}}
-                    ]
+                    "filter": [{"terms": {"unite_legale.etablissements.siret": sirets}}]
                 }
             },
-            "inner_hits": {},
+            "inner_hits": {"size": min(len(sirets), MAX_INNER_HITS)},
         }
     }
-    search = search.query(Q(siret_filter))
+    search = search.filter(Q(siret_filter))
     return search
@@ -1,9 +1,7 @@
 from elasticsearch_dsl import Q
 
 from app.elastic.filters.term_filters import filter_term_list_search_unite_legale
-from app.elastic.helpers.exclude_etablissements import (
-    exclude_etablissements_from_search,
-)
+from app.elastic.helpers.source_fields import select_source_fields
 
 
 def build_es_search_geo_query(es_search_builder):
@@ -47,5 +45,5 @@ def build_es_search_geo_query(es_search_builder):
         Q(geo_query)
     )
 
-    exclude_etablissements_from_search(es_search_builder)
+    select_source_fields(es_search_builder)
     es_search_builder.has_full_text_query = True
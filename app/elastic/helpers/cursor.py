@@ -0,0 +1,72 @@
+import base64
+import binascii
+
+import orjson
+
+from app.exceptions.exceptions import InvalidParamError
+
+# Cursor of the first page, to start paginating with cursors
+FIRST_PAGE_CURSOR = "*"
+
+
+def encode_cursor(sort_values: list) -> str:
+    """Opaque cursor holding the sort values of the last hit of a page."""
+    return base64.urlsafe_b64encode(orjson.dumps(sort_values)).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> list | None:
+    """Sort values to search after, None for the first page."""
+    if cursor == FIRST_PAGE_CURSOR:
+        return None
+    try:
+        sort_values = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, ValueError):
+        sort_values = None
+    if not isinstance(sort_values, list) or not sort_values:
+        raise InvalidParamError(
+            "Le paramètre `cursor` est invalide. Utilisez `cursor=*` pour la "
+            "première page, puis la valeur `cursor` de chaque réponse."
+        )
+    return sort_values
+
+
+class CursorPage:
+    """Page of `per_page` structures, collected out of the hits fetched after
+    `cursor`, along with the cursor of the next page (None after the last page).
+
+    Collapse can not be used with `search_after` : the documents of a same
+    structure, which are sorted next to each other by `identifiant`, are
+    deduplicated here instead. A batch of hits may then hold fewer than
+    `per_page` structures : more hits are fetched after `search_after` until
+    the page is complete.
+    """
+
+    def __init__(self, cursor: str, per_page: int):
+        sort_values = decode_cursor(cursor)
+        self.per_page = per_page
+        self.structures = []
+        self.last_identifiant = sort_values[-1] if sort_values else None
+        # Sort values to fetch the next hits after
+        self.search_after = sort_values
+        self.next_cursor = None
+        self.is_complete = False
+
+    def add_hits(self, structures, size):
+        """Add the structures of the `size` hits fetched after `search_after`."""
+        for structure in structures:
+            if structure["identifiant"] == self.last_identifiant:
+                continue
+            if len(self.structures) == self.per_page:
+                self.next_cursor = encode_cursor(self.structures[-1]["meta"]["sort"])
+                self.is_complete = True
+                return
+            self.structures.append(structure)
+            self.last_identifiant = structure["identifiant"]
+        if len(structures) < size:
+            # No hits left
+            self.is_complete = True
+        elif len(self.structures) == self.per_page:
+            self.next_cursor = encode_cursor(structures[-1]["meta"]["sort"])
+            self.is_complete = True
+        else:
+            self.search_after = structures[-1]["meta"]["sort"]
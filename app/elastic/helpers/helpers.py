@@ -1,32 +1,61 @@
+from app.elastic.helpers.cursor import decode_cursor
 from app.elastic.parsers.siren import is_siren
 
 
-def extract_ul_and_etab_from_es_response(structure):
-    structure_dict = structure.to_dict()
+def extract_ul_and_etab_from_hit(hit: dict) -> dict:
+    """Structure of a raw Elasticsearch hit, as a plain dict.
+
+    Its `meta` holds the hit fields without their leading underscore, as the
+    `meta` of `elasticsearch_dsl` hits, except `_source` and the inner hits :
+    `matching_etablissements` holds the `_source` of the établissements ones.
+    """
+    structure_dict = hit.get("_source", {})
     # Add meta field to response to retrieve score
-    structure_dict["meta"] = structure.meta.to_dict()
+    meta = {
+        key[1:] if key.startswith("_") else key: value
+        for key, value in hit.items()
+        if key not in ("_source", "inner_hits")
+    }
+    if "type" in meta:
+        meta["doc_type"] = meta.pop("type")
+    structure_dict["meta"] = meta
     # Add inner hits field (etablissements)
     try:
-        matching_etablissements = structure_dict["meta"]["inner_hits"][
-            "unite_legale.etablissements"
-        ]["hits"]["hits"]
-        structure_dict["matching_etablissements"] = []
-        for matching_etablissement in matching_etablissements:
-            structure_dict["matching_etablissements"].append(
-                matching_etablissement["_source"].to_dict()
-            )
-    except Exception:
-        structure_dict["matching_etablissements"] = []
+        matching_etablissements = hit["inner_hits"]["unite_legale.etablissements"][
+            "hits"
+        ]["hits"]
+    except KeyError:
+        matching_etablissements = []
+    structure_dict["matching_etablissements"] = [
+        matching_etablissement["_source"]
+        for matching_etablissement in matching_etablissements
+    ]
     return structure_dict
 
 
-def execute_and_agg_total_results_by_identifiant(es_search_builder):
-    es_search_client = es_search_builder.es_search_client
-    es_search_client.aggs.metric("by_cluster", "cardinality", field="identifiant")
-    es_search_client = page_through_results(es_search_builder)
-    es_search_client = es_search_client.execute()
-    es_search_builder.total_results = es_search_client.aggregations.by_cluster.value
-    es_search_builder.execution_time = es_search_client.took
+def build_total_results_by_identifiant_search(search, max_total_results):
+    """Build the search counting distinct `identifiant` (i.e. sirens) matching
+    the query. It is sent in the same `_msearch` as the hits search.
+
+    The aggregation is only meaningful below `max_total_results` (above that,
+    the API returns `max_total_results` by default), so each shard stops
+    collecting after `max_total_results` documents : the count stays exact when
+    it is used, and the aggregation can no longer time out on very broad
+    filters.
+    """
+    count_search = search.extra(
+        size=0,
+        track_total_hits=False,
+        terminate_after=max_total_results,
+    )
+    count_search.aggs.metric("by_cluster", "cardinality", field="identifiant")
+    return count_search
+
+
+def collapse_by_identifiant(search):
+    """Collapse is used to aggregate the results by siren. It is the consequence
+    of separating large documents into smaller ones"""
+    return search.update_from_dict({"collapse": {"field": "identifiant"}})
 
 
 def page_through_results(es_search_builder):
@@ -45,6 +74,16 @@ def page_through_results(es_search_builder):
     return search_client[offset : (offset + size)]
 
 
+def page_through_results_after_cursor(es_search_builder, size):
+    """Fetch `size` hits after the sort values of the cursor, see
+    `CursorPage`."""
+    search_client = es_search_builder.es_search_client[0:size]
+    sort_values = decode_cursor(es_search_builder.search_params.cursor)
+    if sort_values is not None:
+        search_client = search_client.extra(search_after=sort_values)
+    return search_client
+
+
 def should_get_doc_by_id(es_search_builder):
     """
     Determines whether to retrieve document by ID based on search parameters.
@@ -0,0 +1,33 @@
+from elasticsearch_dsl.query import Bool, Query
+
+
+class RawQuery(Query):
+    """Query sent as the given dict, which elasticsearch_dsl neither parses
+    nor copies : it must not be modified once given."""
+
+    name = "raw"
+
+    def __init__(self, query: dict | None = None):
+        super().__init__()
+        self._query = query
+
+    def _clone(self):
+        return RawQuery(self._query)
+
+    def to_dict(self):
+        return self._query
+
+
+def build_raw_bool_query(query: dict) -> Bool:
+    """`bool` query whose clauses are `RawQuery`, so that elasticsearch_dsl can
+    still combine it with the other queries of a search."""
+    return Bool(
+        **{
+            occurrence: (
+                [RawQuery(clause) for clause in clauses]
+                if isinstance(clauses, list)
+                else clauses
+            )
+            for occurrence, clauses in query["bool"].items()
+        }
+    )
@@ -0,0 +1,97 @@
+from app.utils.helpers import create_admin_fields_to_include, create_fields_to_include
+
+# Fields of `unite_legale` read by the formatters, which must be kept in sync with
+# them : fields which are not fetched are formatted as missing.
+# Fields of every unité légale in the response (`siege.nom_commercial` is used to
+# build `nom_complet`)
+UNITE_LEGALE_SOURCE_FIELDS = [
+    "siren",
+    "nom_complet",
+    "nom_raison_sociale",
+    "sigle",
+    "siege.nom_commercial",
+    "denomination_usuelle_1_unite_legale",
+    "denomination_usuelle_2_unite_legale",
+    "denomination_usuelle_3_unite_legale",
+    "nombre_etablissements",
+    "nombre_etablissements_ouverts",
+    "activite_principale_unite_legale",
+    "categorie_entreprise",
+    "caractere_employeur",
+    "annee_categorie_entreprise",
+    "date_creation_unite_legale",
+    "date_fermeture",
+    "date_mise_a_jour",
+    "date_mise_a_jour_insee",
+    "date_mise_a_jour_rne",
+    "etat_administratif_unite_legale",
+    "nature_juridique_unite_legale",
+    "section_activite_principale",
+    "tranche_effectif_salarie_unite_legale",
+    "annee_tranche_effectif_salarie",
+    "statut_diffusion_unite_legale",
+    "display.version",
+    "display.nom_complet",
+]
+
+# Fields of each field group which can be included in the response, see `include`
+# and `include_admin`. Matching établissements and the score are not in `_source`.
+SOURCE_FIELDS_BY_FIELD_TO_INCLUDE = {
+    "SIEGE": ["siege"],
+    "DIRIGEANTS": ["dirigeants_pp", "dirigeants_pm"],
+    "FINANCES": ["bilan_financier"],
+    "COMPLEMENTS": [
+        "colter_code",
+        "colter_code_insee",
+        "colter_elus",
+        "colter_niveau",
+        "convention_collective_renseignee",
+        "liste_idcc_unite_legale",
+        "egapro_renseignee",
+        "est_association",
+        "est_bio",
+        "est_entrepreneur_individuel",
+        "est_entrepreneur_spectacle",
+        "est_ess",
+        "est_finess",
+        "est_organisme_formation",
+        "est_qualiopi",
+        "liste_id_organisme_formation",
+        "est_rge",
+        "est_service_public",
+        "est_siae",
+        "est_societe_mission",
+        "est_uai",
+        "identifiant_association_unite_legale",
+        "statut_entrepreneur_spectacle",
+        "type_siae",
+        "display.type_siae",
+    ],
+    "MATCHING_ETABLISSEMENTS": [],
+    "SCORE": [],
+    "ETABLISSEMENTS": ["etablissements"],
+    "SLUG": ["slug"],
+    "IMMATRICULATION": ["immatriculation"],
+}
+
+
+def get_source_fields(search_params) -> list[str]:
+    """`_source` fields of the documents needed to format the response, which
+    depend on `minimal`, `include` and `include_admin`."""
+    fields_to_include = create_fields_to_include(
+        search_params
+    ) + create_admin_fields_to_include(search_params)
+    unite_legale_fields = UNITE_LEGALE_SOURCE_FIELDS + [
+        source_field
+        for field in fields_to_include
+        for source_field in SOURCE_FIELDS_BY_FIELD_TO_INCLUDE[field]
+    ]
+    return ["identifiant"] + [f"unite_legale.{field}" for field in unite_legale_fields]
+
+
+def select_source_fields(es_search_builder):
+    # Only fetch the fields of the documents which are in the response, the
+    # établissements list in particular is only fetched when requested
+    es_search_builder.es_search_client = es_search_builder.es_search_client.source(
+        includes=get_source_fields(es_search_builder.search_params)
+    )
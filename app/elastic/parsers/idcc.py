@@ -0,0 +1,11 @@
+import re
+
+
+def is_idcc(query_string: str) -> bool:
+    """
+    Check if string is an IDCC (composed of exactly 4 digits).
+    """
+
+    if query_string is None or not isinstance(query_string, str):
+        return False
+    return bool(re.fullmatch(r"^\d{4}$", query_string))
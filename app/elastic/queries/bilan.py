@@ -11,7 +11,7 @@ def search_bilan(
     search_options = []
     bilan_filters = []
     for filter in bilan_filters_to_include:
-        filter_value = search_params.dict().get(filter, None)
+        filter_value = search_params.active_params.get(filter)
         if filter_value is not None:
             if "min" in filter:
                 operator = "gte"
@@ -38,7 +38,7 @@ def search_person(
         person_filters = []
         boost_queries = []
         # Nom
-        nom_person = search_params.dict().get(param_nom, "None")
+        nom_person = search_params.active_params.get(param_nom)
         if nom_person:
             # Remove stop words from the name
             nom_person_filtered = remove_stop_words(nom_person)
@@ -79,7 +79,7 @@ def search_person(
             )
 
         # Prénoms
-        prenoms_person = search_params.dict().get(param_prenom, None)
+        prenoms_person = search_params.active_params.get(param_prenom)
         if prenoms_person:
             # Remove stop words
             prenoms_person_filtered = remove_stop_words(prenoms_person)
@@ -111,7 +111,7 @@ def search_person(
             )
 
         # Date de naissance
-        min_date_naiss_person = search_params.dict().get(param_date_min, None)
+        min_date_naiss_person = search_params.active_params.get(param_date_min)
         if min_date_naiss_person:
             person_filters.append(
                 {
@@ -126,7 +126,7 @@ def search_person(
                 }
             )
 
-        max_date_naiss_person = search_params.dict().get(param_date_max, None)
+        max_date_naiss_person = search_params.active_params.get(param_date_max)
         if max_date_naiss_person:
             person_filters.append(
                 {
@@ -0,0 +1,69 @@
+from app.elastic.es_client import execute_search
+from app.elastic.es_index import StructureMapping
+from app.elastic.filters.siren import filter_by_sirens
+from app.elastic.filters.siret import filter_by_sirets
+from app.elastic.helpers.helpers import (
+    collapse_by_identifiant,
+    extract_ul_and_etab_from_hit,
+)
+
+
+def build_sirens_lookup_search(sirens, source_fields=None):
+    """Search the structures of a list of sirens, without scoring nor sorting.
+    The documents of large structures are collapsed into one.
+
+    Only the `source_fields` of the documents are fetched, if given."""
+    search = filter_by_sirens(StructureMapping.search(), sirens)
+    search = collapse_by_identifiant(search)
+    if source_fields is not None:
+        search = search.source(includes=source_fields)
+    return search.extra(size=len(sirens))
+
+
+def build_sirets_lookup_search(sirets, source_fields=None):
+    """Search the structures of a list of sirets, without scoring nor sorting.
+
+    Documents are not collapsed : the établissements of a large structure are
+    split across its documents, and the sirets may belong to different ones.
+    Only the `source_fields` of the documents are fetched, if given.
+    """
+    search = filter_by_sirets(StructureMapping.search(), sirets)
+    if source_fields is not None:
+        search = search.source(includes=source_fields)
+    return search.extra(size=len(sirets))
+
+
+def extract_structures_by_siren(es_response: dict) -> dict[str, dict]:
+    """Structures of the raw body of a sirens lookup, by siren."""
+    structures = {}
+    for matching_structure in es_response["hits"]["hits"]:
+        structure = extract_ul_and_etab_from_hit(matching_structure)
+        structures[structure["unite_legale"]["siren"]] = structure
+    return structures
+
+
+def extract_structures_by_siret(es_response: dict) -> dict[str, dict]:
+    """Structures of the raw body of a sirets lookup, by siret.
+
+    Each structure only keeps the matching établissement of its siret, as when
+    looking up a single siret."""
+    structures = {}
+    for matching_structure in es_response["hits"]["hits"]:
+        structure = extract_ul_and_etab_from_hit(matching_structure)
+        for etablissement in structure["matching_etablissements"]:
+            structures[etablissement["siret"]] = {
+                **structure,
+                "matching_etablissements": [etablissement],
+            }
+    return structures
+
+
+async def search_index_by_sirens(
+    sirens: list[str], source_fields=None
+) -> dict[str, dict]:
+    """Structures of the given sirens, by siren. Only the `source_fields` of
+    the documents are fetched, if given."""
+    es_response = await execute_search(
+        build_sirens_lookup_search(sirens, source_fields), raw=True
+    )
+    return extract_structures_by_siren(es_response)
@@ -18,14 +18,13 @@ from app.elastic.helpers.bilan_filters_used import is_any_bilan_filter_used
 from app.elastic.helpers.etablissements_filters_used import (
     is_any_etablissement_filter_used,
 )
-from app.elastic.helpers.exclude_etablissements import (
-    exclude_etablissements_from_search,
-)
 from app.elastic.helpers.helpers import (
     get_doc_id_from_page,
     should_get_doc_by_id,
     sort_search_by_company_size,
 )
+from app.elastic.helpers.raw_query import build_raw_bool_query
+from app.elastic.helpers.source_fields import select_source_fields
 from app.elastic.parsers.siren import is_siren
 from app.elastic.parsers.siret import is_siret
 from app.elastic.queries.bilan import search_bilan
@@ -47,6 +46,7 @@ def build_es_search_text_query(es_search_builder):
     # Filter by siren/siret first (if query is a `siren` or 'siret' number),
     # and return search results directly without text search.
     elif is_siren(query_terms) or is_siret(query_terms):
+        es_search_builder.is_identifier_lookup = True
         query_terms_clean = query_terms.replace(" ", "")
         if is_siren(query_terms):
             es_search_builder.es_search_client = filter_by_siren(
@@ -153,7 +153,9 @@ def build_es_search_text_query(es_search_builder):
                     )
                 )
                 es_search_builder.es_search_client = (
-                    es_search_builder.es_search_client.query(Q(text_query_with_filters))
+                    es_search_builder.es_search_client.query(
+                        build_raw_bool_query(text_query_with_filters)
+                    )
                 )
 
             # Filters applied on établissements without text search
@@ -177,7 +179,9 @@ def build_es_search_text_query(es_search_builder):
                 sort_by_size=sort_by_size,
             )
             es_search_builder.es_search_client = (
-                es_search_builder.es_search_client.query(Q(text_query))
+                es_search_builder.es_search_client.query(
+                    build_raw_bool_query(text_query)
+                )
             )
 
         # Search by chiffre d'affaire or resultat net in bilan_financier
@@ -262,7 +266,7 @@ def build_es_search_text_query(es_search_builder):
             "nom_personne",
             "prenoms_personne",
         ]:
-            if es_search_builder.search_params.dict().get(item, None):
+            if es_search_builder.search_params.active_params.get(item):
                 es_search_builder.has_full_text_query = True
 
-        exclude_etablissements_from_search(es_search_builder)
+    select_source_fields(es_search_builder)
@@ -11,6 +11,7 @@ from app.exceptions.exceptions import (
     InvalidSirenError,
     NotFoundError,
     SearchApiError,
+    ServiceUnavailableError,
 )
 
 
@@ -67,4 +68,5 @@ def add_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(InvalidSirenError, create_exception_handler())
     app.add_exception_handler(InvalidParamError, create_exception_handler())
     app.add_exception_handler(NotFoundError, create_exception_handler())
+    app.add_exception_handler(ServiceUnavailableError, create_exception_handler())
     app.add_exception_handler(Exception, unhandled_exception_handler)
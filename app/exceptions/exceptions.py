@@ -49,6 +49,17 @@ class InternalError(SearchApiError):
         )
 
 
+class ServiceUnavailableError(SearchApiError):
+    """Service temporarily unavailable, e.g. a remote file can not be fetched"""
+
+    def __init__(self, message):
+        super().__init__(
+            message=message,
+            name="",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+
 class NotFoundError(SearchApiError):
     """Resource not found error"""
 
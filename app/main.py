@@ -1,33 +1,49 @@
+from contextlib import asynccontextmanager
+
 import yaml
 from elasticapm.contrib.starlette import ElasticAPM, make_apm_client
-from elasticsearch_dsl import connections
 from fastapi import FastAPI, Request
 from fastapi.responses import RedirectResponse
 
 from app.config import settings
+from app.elastic.es_client import close_es_client
 from app.exceptions.exception_handlers import add_exception_handlers
 from app.exceptions.exceptions import (
     NotFoundError,
 )
 from app.logging import setup_logging, setup_sentry
 from app.routers import admin, public
+from app.service.convention_collective import get_metadata_cc_document
+from app.service.last_modified import get_updates_document
+from app.utils.http_client import close_http_client
+from app.utils.matomo import get_matomo_tracker
+from app.utils.redis import RedisClient
 
 # Setup logging
 setup_logging()
 
 
-# Connect to Elasticsearch
-connections.create_connection(
-    hosts=[str(settings.elastic.url)],
-    http_auth=(settings.elastic.user, settings.elastic.password.get_secret_value()),
-    retry_on_timeout=True,
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    metadata_documents = [get_metadata_cc_document(), get_updates_document()]
+    for metadata_document in metadata_documents:
+        metadata_document.start()
+    yield
+    for metadata_document in metadata_documents:
+        await metadata_document.stop()
+    # Release Elasticsearch, Redis and HTTP connections on shutdown
+    await close_es_client()
+    await RedisClient().close()
+    await close_http_client()
+    await get_matomo_tracker().close()
+
 
 app = FastAPI(
     title="API Recherche d'entreprises",
     version="1.0.0",
     docs_url=None,
     redoc_url="/docs/",
+    lifespan=lifespan,
 )
 
 
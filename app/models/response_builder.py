@@ -1,9 +1,10 @@
-from app.models.response import ResponseModel
 from app.service.format_search_results import format_search_results
 from app.utils.helpers import is_dev_env
 
 
 class ResponseBuilder:
+    """Build the `/search` response body, see `format_search_results`."""
+
     def __init__(self, search_params, es_search_results):
         self.total_results = min(int(es_search_results.total_results), 10000)
         self.per_page = search_params.per_page
@@ -12,16 +13,18 @@ class ResponseBuilder:
         )
         self.page = search_params.page
         self.total_pages = self.calculate_total_pages()
-        response = ResponseModel(
-            results=self.results,
-            total_results=self.total_results,
-            page=self.page,
-            per_page=self.per_page,
-            total_pages=self.total_pages,
-        )
+        response = {
+            "results": self.results,
+            "total_results": self.total_results,
+            "page": self.page,
+            "per_page": self.per_page,
+            "total_pages": self.total_pages,
+        }
         if is_dev_env():
-            response.execution_time = es_search_results.execution_time
-        self.response = response.dict(exclude_unset=True)
+            response["execution_time"] = es_search_results.execution_time
+        if search_params.cursor:
+            response["cursor"] = es_search_results.cursor
+        self.response = response
 
     def calculate_total_pages(self):
         quotient, remainder = divmod(
@@ -1,20 +1,34 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
 from app.service.convention_collective import (
     fetch_idcc_siret_mapping,
+    fetch_idcc_siret_mappings,
     get_metadata_cc_response,
+    stream_idcc_sirets_response,
 )
 from app.service.last_modified import get_last_modified_response
+from app.utils.matomo import get_matomo_tracker
+from app.utils.memory_cache import get_memory_cache
+from app.utils.redis import RedisClient
 
 router = APIRouter()
 
 
 @router.get("/idcc/metadata")
-async def conventions_collectives_endpoint():
+async def conventions_collectives_endpoint(request: Request):
     """
     Endpoint for serving the convention collective JSON file.
     """
-    return get_metadata_cc_response()
+    return await get_metadata_cc_response(request)
+
+
+@router.post("/idcc/batch")
+async def search_conventions_collectives_by_sirens_endpoint(request: Request):
+    """
+    Endpoint for searching conventions collectives by SIREN numbers, given as a
+    JSON array.
+    """
+    return await fetch_idcc_siret_mappings(request)
 
 
 @router.get("/idcc/{siren}")
@@ -22,12 +36,39 @@ async def search_conventions_collectives_by_siren_endpoint(siren: str):
     """
     Endpoint for searching conventions collectives by SIREN number.
     """
-    return fetch_idcc_siret_mapping(siren)
+    return await fetch_idcc_siret_mapping(siren)
+
+
+@router.get("/idcc/{idcc}/sirets")
+async def search_sirets_by_convention_collective_endpoint(idcc: str):
+    """
+    Endpoint for listing the SIRET numbers of all the établissements under a
+    convention collective.
+    """
+    return await stream_idcc_sirets_response(idcc)
 
 
 @router.get("/sources/last_modified")
-async def last_modified_endpoint():
+async def last_modified_endpoint(request: Request):
     """
     Endpoint for serving data sources' last modified dates JSON file.
     """
-    return get_last_modified_response()
+    return await get_last_modified_response(request)
+
+
+@router.get("/cache/stats", include_in_schema=False)
+async def cache_stats_endpoint():
+    """
+    Endpoint for monitoring the in-memory cache and the Redis circuit breaker of
+    the worker serving the request.
+    """
+    return {"memory": get_memory_cache().stats(), "redis": RedisClient().stats()}
+
+
+@router.get("/tracking/stats", include_in_schema=False)
+async def tracking_stats_endpoint():
+    """
+    Endpoint for monitoring the Matomo tracking queue of the worker serving the
+    request.
+    """
+    return get_matomo_tracker().stats()
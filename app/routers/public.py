@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Request
 
 from app.service.build_api_response import build_api_response
+from app.service.build_batch_api_response import build_batch_api_response
+from app.service.build_export_response import build_export_response
 from app.service.search_type import SearchType
 
 router = APIRouter()
@@ -8,7 +10,7 @@ router = APIRouter()
 
 @router.get("/search")
 async def search_text_endpoint(request: Request):
-    return build_api_response(
+    return await build_api_response(
         request,
         search_type=SearchType.TEXT,
     )
@@ -16,7 +18,17 @@ async def search_text_endpoint(request: Request):
 
 @router.get("/near_point")
 async def near_point_endpoint(request: Request):
-    return build_api_response(
+    return await build_api_response(
         request,
         search_type=SearchType.GEO,
     )
+
+
+@router.post("/search/batch")
+async def search_batch_endpoint(request: Request):
+    return await build_batch_api_response(request)
+
+
+@router.get("/search/export")
+async def search_export_endpoint(request: Request):
+    return await build_export_response(request)
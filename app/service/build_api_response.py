@@ -1,17 +1,31 @@
-from fastapi.responses import ORJSONResponse
+from datetime import timedelta
 
+from fastapi.responses import ORJSONResponse, Response
+
+from app.config import settings
 from app.controller.search_params_builder import SearchParamsBuilder
 from app.elastic.es_search_runner import ElasticSearchRunner
 from app.models.response_builder import ResponseBuilder
+from app.utils.cache import (
+    build_key,
+    build_search_cache_key,
+    get_raw_cache_value,
+    set_raw_cache_value,
+)
+from app.utils.cache_policy import get_request_sketch
 from app.utils.matomo import track_event
+from app.utils.redis import RedisClient
 
 
-def build_api_response(
+async def build_api_response(
     request,
     search_type,
 ) -> dict[str, int]:
     """Create and format API response.
 
+    The serialized response is cached, when its search results are, so that
+    cache hits skip formatting altogether.
+
     Args:
         request: HTTP request.
         search_type: type of search.
@@ -21,6 +35,35 @@ def build_api_response(
     """
     track_event(request)
     search_params = SearchParamsBuilder.extract_params(request, search_type)
-    es_search_results = ElasticSearchRunner(search_params, search_type)
+    search_cache_key = build_search_cache_key(search_type, search_params)
+    # Requests served from the response cache are counted too
+    requests = get_request_sketch().add(search_cache_key)
+    response_cache_key = None
+    if settings.cache.response_cache_enabled:
+        response_cache_key = build_key(f"response:{search_cache_key}")
+        cached_response = await get_raw_cache_value(RedisClient(), response_cache_key)
+        if cached_response:
+            return Response(content=cached_response, media_type="application/json")
+
+    es_search_results = ElasticSearchRunner(search_params, search_type, requests)
+    await es_search_results.run()
     formatted_response = ResponseBuilder(search_params, es_search_results)
-    return ORJSONResponse(content=formatted_response.response)
+    response = ORJSONResponse(content=formatted_response.response)
+
+    if response_cache_key:
+        time_to_live = get_response_time_to_live(es_search_results)
+        if time_to_live > timedelta(0):
+            await set_raw_cache_value(
+                RedisClient(), response_cache_key, response.body, time_to_live
+            )
+    return response
+
+
+def get_response_time_to_live(es_search_results) -> timedelta:
+    """Responses are not served stale : they are cached until their search
+    results become stale, and for at most `settings.cache.response_time_to_live`.
+    Responses built from stale search results are not cached."""
+    return min(
+        es_search_results.get_remaining_freshness(),
+        timedelta(seconds=settings.cache.response_time_to_live),
+    )
@@ -0,0 +1,261 @@
+import asyncio
+import logging
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+from app.controller.search_params_builder import SearchParamsBuilder
+from app.controller.search_params_model import SearchParams
+from app.elastic.es_client import execute_multi_search
+from app.elastic.es_search_runner import ElasticSearchRunner
+from app.elastic.helpers.source_fields import get_source_fields
+from app.elastic.parsers.siren import is_siren
+from app.elastic.parsers.siret import is_siret
+from app.elastic.queries.search_by_identifiers import (
+    build_sirens_lookup_search,
+    build_sirets_lookup_search,
+    extract_structures_by_siren,
+    extract_structures_by_siret,
+)
+from app.exceptions.exceptions import InternalError, InvalidParamError, SearchApiError
+from app.models.response_builder import ResponseBuilder
+from app.service.search_type import SearchType
+from app.utils.cache import (
+    build_key,
+    build_search_cache_key,
+    cache_value,
+    get_cache_entry,
+)
+from app.utils.cache_policy import get_request_sketch
+from app.utils.matomo import track_event
+from app.utils.redis import RedisClient
+
+BATCH_MAX_SIZE = 100
+
+UNEXPECTED_ERROR_MESSAGE = (
+    "Une erreur inattendue s'est produite. Veuillez réessayer plus tard."
+)
+
+
+async def build_batch_api_response(request) -> ORJSONResponse:
+    """Run a batch of searches with a single Elasticsearch `_msearch`, in which
+    SIREN and SIRET lookups are merged.
+
+    The request body is a JSON array of searches, each one being an object
+    holding the query parameters of a `/search` call. The response is an array
+    holding, in the same order, the response `/search` would have returned for
+    each search, or its error. Search results are cached as in `/search`.
+    """
+    track_event(request)
+    batch = await parse_batch(request)
+    responses = [None] * len(batch)
+
+    # Searches sharing the same parameters are only run once
+    searches = {}
+    for index, params in enumerate(batch):
+        try:
+            search_params = get_search_params(params)
+            search_cache_key = build_search_cache_key(SearchType.TEXT, search_params)
+            es_search_results = ElasticSearchRunner(
+                search_params,
+                SearchType.TEXT,
+                get_request_sketch().add(search_cache_key),
+            )
+            es_search_results.build_es_search_query()
+        except Exception as error:
+            responses[index] = format_error(error)
+            continue
+        cache_key = build_key(search_cache_key)
+        searches.setdefault(cache_key, (es_search_results, []))[1].append(index)
+
+    searches_to_run = await get_searches_from_cache(searches)
+    errors = await run_searches(searches_to_run)
+
+    for cache_key, (es_search_results, indexes) in searches.items():
+        if cache_key in errors:
+            response = errors[cache_key]
+        else:
+            try:
+                response = ResponseBuilder(
+                    es_search_results.search_params, es_search_results
+                ).response
+            except Exception as error:
+                response = format_error(error)
+        for index in indexes:
+            responses[index] = response
+    return ORJSONResponse(content=responses)
+
+
+async def parse_batch(request) -> list:
+    try:
+        batch = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise InvalidParamError("Le corps de la requête doit être un JSON valide.")
+    if not isinstance(batch, list) or not batch:
+        raise InvalidParamError(
+            "Le corps de la requête doit être une liste de recherches."
+        )
+    if len(batch) > BATCH_MAX_SIZE:
+        raise InvalidParamError(
+            f"Le nombre de recherches par requête est limité à {BATCH_MAX_SIZE}."
+        )
+    return batch
+
+
+def get_search_params(params) -> SearchParams:
+    """Validate the parameters of a search as query parameters of `/search`,
+    whose values are strings. Parameters set to `null` are absent."""
+    if not isinstance(params, dict):
+        raise InvalidParamError(
+            "Chaque recherche doit être un objet contenant ses paramètres."
+        )
+    query_params = {}
+    for param, param_value in params.items():
+        if param_value is None:
+            continue
+        if isinstance(param_value, bool):
+            query_params[param] = str(param_value).lower()
+        elif isinstance(param_value, list):
+            query_params[param] = ",".join(str(value) for value in param_value)
+        else:
+            query_params[param] = str(param_value)
+    return SearchParams(**SearchParamsBuilder.map_parameters(query_params))
+
+
+async def get_searches_from_cache(searches: dict) -> dict:
+    """Load the cached results of the searches, and return the searches left
+    to run. Stale results are refreshed by running their search in the batch."""
+    redis_client_cache = RedisClient()
+    cache_entries = await asyncio.gather(
+        *(get_cache_entry(redis_client_cache, cache_key) for cache_key in searches)
+    )
+    searches_to_run = {}
+    for (cache_key, (es_search_results, _)), cache_entry in zip(
+        searches.items(), cache_entries
+    ):
+        if cache_entry and cache_entry.value and cache_entry.is_fresh():
+            es_search_results.set_results_from_cache(cache_entry.value)
+        else:
+            searches_to_run[cache_key] = es_search_results
+    return searches_to_run
+
+
+async def run_searches(searches_to_run: dict) -> dict:
+    """Run the searches in a single `_msearch` and cache their results.
+
+    SIREN and SIRET lookups are merged into one search per kind of identifier.
+    Returns the formatted errors of the searches which failed.
+    """
+    if not searches_to_run:
+        return {}
+    lookups = {
+        cache_key: es_search_results
+        for cache_key, es_search_results in searches_to_run.items()
+        if es_search_results.is_identifier_lookup
+    }
+    other_searches = {
+        cache_key: es_search_results
+        for cache_key, es_search_results in searches_to_run.items()
+        if not es_search_results.is_identifier_lookup
+    }
+    es_searches = []
+    for es_search_results in other_searches.values():
+        es_searches.extend(es_search_results.get_es_searches())
+    sirens, sirets = get_lookup_identifiers(lookups)
+    source_fields = get_lookup_source_fields(lookups)
+    if sirens:
+        es_searches.append(build_sirens_lookup_search(sirens, source_fields))
+    if sirets:
+        es_searches.append(build_sirets_lookup_search(sirets, source_fields))
+    es_responses = iter(
+        await execute_multi_search(es_searches, raise_on_error=False, raw=True)
+    )
+
+    errors = {}
+    for cache_key, es_search_results in other_searches.items():
+        es_response, es_count_response = next(es_responses), next(es_responses)
+        try:
+            for response in (es_response, es_count_response):
+                if isinstance(response, Exception):
+                    raise response
+            es_search_results.format_es_search_responses(es_response, es_count_response)
+            await es_search_results.complete_cursor_page()
+        except Exception as error:
+            errors[cache_key] = format_error(error)
+    if lookups:
+        lookup_responses = []
+        if sirens:
+            lookup_responses.append((next(es_responses), extract_structures_by_siren))
+        if sirets:
+            lookup_responses.append((next(es_responses), extract_structures_by_siret))
+        errors.update(format_lookup_responses(lookups, lookup_responses))
+
+    redis_client_cache = RedisClient()
+    for cache_key, es_search_results in searches_to_run.items():
+        if cache_key not in errors:
+            await cache_value(
+                redis_client_cache,
+                cache_key,
+                es_search_results.get_results_to_cache(),
+                es_search_results.should_cache_for_how_long(),
+            )
+    return errors
+
+
+def get_lookup_identifier(es_search_results) -> str:
+    return es_search_results.search_params.terms.replace(" ", "")
+
+
+def get_lookup_identifiers(lookups: dict) -> tuple[list[str], list[str]]:
+    identifiers = {get_lookup_identifier(lookup) for lookup in lookups.values()}
+    sirens = sorted(identifier for identifier in identifiers if is_siren(identifier))
+    sirets = sorted(identifier for identifier in identifiers if is_siret(identifier))
+    return sirens, sirets
+
+
+def get_lookup_source_fields(lookups: dict) -> list[str]:
+    """Fields needed by any of the merged lookups."""
+    source_fields = {
+        source_field
+        for lookup in lookups.values()
+        for source_field in get_source_fields(lookup.search_params)
+    }
+    return sorted(source_fields)
+
+
+def format_lookup_responses(lookups: dict, lookup_responses: list) -> dict:
+    """Dispatch the structures found by the merged lookups to each lookup.
+
+    Returns the formatted errors of the lookups, which all fail if one of the
+    merged searches failed.
+    """
+    structures = {}
+    execution_time = 0
+    try:
+        for es_response, extract_structures in lookup_responses:
+            if isinstance(es_response, Exception):
+                raise es_response
+            structures.update(extract_structures(es_response))
+            execution_time = max(execution_time, es_response["took"])
+    except Exception as error:
+        return {cache_key: format_error(error) for cache_key in lookups}
+
+    for lookup in lookups.values():
+        structure = structures.get(get_lookup_identifier(lookup))
+        matching_structures = [structure] if structure else []
+        offset = (lookup.search_params.page - 1) * lookup.search_params.per_page
+        lookup.format_identifier_lookup_results(
+            matching_structures[offset : offset + lookup.search_params.per_page],
+            total_results=len(matching_structures),
+            execution_time=execution_time,
+        )
+    return {}
+
+
+def format_error(error: Exception) -> dict:
+    """Body of the error response `/search` would have returned, with its
+    status code."""
+    if not isinstance(error, SearchApiError):
+        logging.error(f"Error while running batch search: {error}", exc_info=True)
+        error = InternalError(UNEXPECTED_ERROR_MESSAGE)
+    return {"erreur": error.message, "status_code": error.status_code}
@@ -0,0 +1,72 @@
+import orjson
+from fastapi.responses import StreamingResponse
+
+from app.controller.search_params_builder import SearchParamsBuilder
+from app.elastic.es_client import iterate_search_pages
+from app.elastic.es_search_runner import ElasticSearchRunner
+from app.elastic.helpers.helpers import extract_ul_and_etab_from_hit
+from app.elastic.text_search import build_es_search_text_query
+from app.service.format_search_results import (
+    format_single_unite_legale,
+    get_fields_to_include,
+)
+from app.service.search_type import SearchType
+from app.utils.matomo import track_event
+
+EXPORT_PAGE_SIZE = 1000
+
+# The documents of a structure share its `identifiant`, sorting on it keeps them
+# next to each other. Collapse can not be used with `search_after`.
+EXPORT_SORT = [{"identifiant": {"order": "asc"}}]
+
+
+async def build_export_response(request) -> StreamingResponse:
+    """Stream all the unités légales matching a search, as NDJSON.
+
+    The search parameters are those of `/search`, except pagination : results
+    are not limited to 10 000, they are sorted by siren rather than relevance,
+    and fetched from Elasticsearch one page at a time as the client reads them.
+    """
+    track_event(request)
+    search_params = SearchParamsBuilder.extract_params(request, SearchType.TEXT)
+    es_search_builder = ElasticSearchRunner(search_params, SearchType.TEXT)
+    build_es_search_text_query(es_search_builder)
+
+    lines = stream_unites_legales(es_search_builder.es_search_client, search_params)
+    # Fetch the first page before answering, so that a failing search gets an
+    # error response rather than an interrupted stream
+    first_lines = await anext(lines, b"")
+    return StreamingResponse(
+        prepend(first_lines, lines), media_type="application/x-ndjson"
+    )
+
+
+async def stream_unites_legales(search, search_params):
+    """Yield formatted unités légales, one page of NDJSON lines at a time."""
+    last_identifiant = None
+    fields_to_include = get_fields_to_include(search_params)
+    async for es_response in iterate_search_pages(
+        search, EXPORT_SORT, EXPORT_PAGE_SIZE, raw=True
+    ):
+        lines = []
+        for matching_structure in es_response["hits"]["hits"]:
+            identifiant = matching_structure["_source"]["identifiant"]
+            if identifiant == last_identifiant:
+                continue
+            last_identifiant = identifiant
+            structure = extract_ul_and_etab_from_hit(matching_structure)
+            if "unite_legale" not in structure:
+                continue
+            unite_legale = format_single_unite_legale(
+                structure, search_params, fields_to_include
+            )
+            lines.append(orjson.dumps(unite_legale, option=orjson.OPT_NON_STR_KEYS))
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+
+
+async def prepend(first_item, items):
+    if first_item:
+        yield first_item
+    async for item in items:
+        yield item
@@ -1,62 +1,200 @@
+import asyncio
 from datetime import timedelta
+from functools import lru_cache
 
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from app.config import settings
+from app.elastic.es_client import iterate_search_pages
+from app.elastic.es_index import StructureMapping
+from app.elastic.filters.idcc import filter_by_idcc
+from app.elastic.parsers.idcc import is_idcc
 from app.elastic.parsers.siren import is_siren
-from app.elastic.queries.search_by_siren import search_index_by_siren
-from app.exceptions.exceptions import InvalidSirenError
-from app.models.response import CcResponseModel
+from app.elastic.queries.search_by_identifiers import search_index_by_sirens
+from app.exceptions.exceptions import InvalidParamError, InvalidSirenError
+from app.service.build_export_response import EXPORT_SORT
 from app.service.formatters.convention_collective import (
     extract_idcc_siret_mapping_from_ul,
 )
-from app.utils.cache import cache_strategy
-from app.utils.helpers import fetch_json_from_url
+from app.utils.cache import build_key, cache_value, get_cache_entry
+from app.utils.metadata_document import MetadataDocument
+from app.utils.redis import RedisClient
+
+IDCC_BATCH_MAX_SIZE = 100
+
+IDCC_SIRETS_PAGE_SIZE = 1000
+
+# Bump to invalidate cached IDCC mappings when their content changes
+IDCC_CACHE_KEY_VERSION = 1
+
+# Fields of the documents the IDCC mapping is built from
+IDCC_SOURCE_FIELDS = [
+    "unite_legale.siren",
+    "unite_legale.sirets_par_idcc",
+    "unite_legale.display.version",
+    "unite_legale.display.sirets_par_idcc",
+]
 
 
 def should_cache_for_how_long():
     return timedelta(hours=24)
 
 
-def get_metadata_json():
-    return fetch_json_from_url(str(settings.metadata.url_cc_json))
+@lru_cache
+def get_metadata_cc_document() -> MetadataDocument:
+    return MetadataDocument(
+        "cc_kali_json",
+        str(settings.metadata.url_cc_json),
+        settings.metadata.refresh_interval,
+        settings.metadata.retry_interval,
+    )
 
 
-def get_metadata_cc_response():
-    cache_key = "cc_kali_json"
-    json_content = cache_strategy(
-        cache_key,
-        get_metadata_json,
-        should_cache_for_how_long,
-    )
-    return JSONResponse(json_content)
+async def get_metadata_cc_response(request):
+    return await get_metadata_cc_document().get_response(request)
 
 
-def fetch_idcc_siret_mapping(siren):
+async def fetch_idcc_siret_mapping(siren):
     """
     Retrieves the detailed list of SIRET numbers associated with an IDCC for a
     given SIREN number.
 
     Args:
-        request : The HTTP request object containing 'siren'
-        in match_info.
+        siren : The SIREN number.
 
     Returns:
-        Response: response containing the list of IDCCs or an empty
-        list if no match found.
+        Response: response mapping each IDCC to its SIRET numbers, empty if no
+        match found.
 
     Raises:
-        ValueError: If the SIREN number is invalid.
+        InvalidSirenError: If the SIREN number is invalid.
     """
     if not is_siren(siren):
         raise InvalidSirenError()
 
-    match_siren = search_index_by_siren(siren)
+    idcc_mappings = await get_idcc_siret_mappings([siren])
+    return ORJSONResponse(idcc_mappings[siren])
+
 
-    if not match_siren:
-        return JSONResponse({})
+async def fetch_idcc_siret_mappings(request):
+    """Batch variant of `fetch_idcc_siret_mapping`.
+
+    The request body is a JSON array of SIREN numbers, the response maps each
+    of them to its IDCC mapping.
+    """
+    try:
+        sirens = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise InvalidParamError("Le corps de la requête doit être un JSON valide.")
+    if not isinstance(sirens, list) or not sirens:
+        raise InvalidParamError(
+            "Le corps de la requête doit être une liste de numéros Siren."
+        )
+    if len(sirens) > IDCC_BATCH_MAX_SIZE:
+        raise InvalidParamError(
+            f"Le nombre de numéros Siren par requête est limité à "
+            f"{IDCC_BATCH_MAX_SIZE}."
+        )
+    for siren in sirens:
+        if not isinstance(siren, str) or not is_siren(siren):
+            raise InvalidSirenError()
+
+    return ORJSONResponse(await get_idcc_siret_mappings(sirens))
+
+
+def build_idcc_cache_key(siren: str) -> str:
+    return build_key(f"idcc:v{IDCC_CACHE_KEY_VERSION}:{siren}")
+
+
+async def get_idcc_siret_mappings(sirens: list[str]) -> dict[str, dict]:
+    """IDCC mappings of the given sirens, by siren.
+
+    Mappings are cached per siren. Those which are not are fetched with a single
+    search, reading only the fields they are built from.
+    """
+    sirens = list(dict.fromkeys(sirens))
+    redis_client_cache = RedisClient()
+    cache_keys = [build_idcc_cache_key(siren) for siren in sirens]
+    cache_entries = await asyncio.gather(
+        *(get_cache_entry(redis_client_cache, cache_key) for cache_key in cache_keys)
+    )
+    idcc_mappings = {
+        siren: cache_entry.value
+        for siren, cache_entry in zip(sirens, cache_entries)
+        if cache_entry is not None
+    }
+
+    sirens_to_fetch = [siren for siren in sirens if siren not in idcc_mappings]
+    if sirens_to_fetch:
+        structures = await search_index_by_sirens(sirens_to_fetch, IDCC_SOURCE_FIELDS)
+        for siren in sirens_to_fetch:
+            structure = structures.get(siren)
+            # Sirens which are not indexed have an empty mapping
+            idcc_mappings[siren] = (
+                extract_idcc_siret_mapping_from_ul(structure) if structure else {}
+            )
+        await asyncio.gather(
+            *(
+                cache_value(
+                    redis_client_cache,
+                    build_idcc_cache_key(siren),
+                    idcc_mappings[siren],
+                    should_cache_for_how_long(),
+                )
+                for siren in sirens_to_fetch
+            )
+        )
+    return {siren: idcc_mappings[siren] for siren in sirens}
+
+
+async def stream_idcc_sirets_response(idcc) -> StreamingResponse:
+    """Stream the SIRET numbers of all the établissements under a convention
+    collective, as a JSON array.
+
+    The structures with an établissement under the convention collective are
+    found with the `liste_idcc` of their établissements, and fetched one page
+    at a time, with only their SIRET numbers by IDCC.
+    """
+    if not is_idcc(idcc):
+        raise InvalidParamError("Le paramètre `idcc` doit contenir 4 chiffres.")
+    search = filter_by_idcc(StructureMapping.search(), idcc).source(
+        includes=["identifiant"] + IDCC_SOURCE_FIELDS
+    )
+    chunks = stream_idcc_sirets(search, idcc)
+    # Fetch the first page before answering, so that a failing search gets an
+    # error response rather than an interrupted stream
+    first_chunk = await anext(chunks, None)
+    return StreamingResponse(
+        build_json_array(first_chunk, chunks), media_type="application/json"
+    )
 
-    idcc_mapping = extract_idcc_siret_mapping_from_ul(match_siren)
 
-    response_data = CcResponseModel(root=idcc_mapping)
-    return response_data
+async def stream_idcc_sirets(search, idcc):
+    """Yield the SIRET numbers under the convention collective, one page of
+    structures at a time, as comma separated JSON strings."""
+    last_identifiant = None
+    async for es_response in iterate_search_pages(
+        search, EXPORT_SORT, IDCC_SIRETS_PAGE_SIZE, raw=True
+    ):
+        sirets = []
+        for matching_structure in es_response["hits"]["hits"]:
+            structure = matching_structure["_source"]
+            # The documents of a large structure share its IDCC mapping
+            if structure["identifiant"] == last_identifiant:
+                continue
+            last_identifiant = structure["identifiant"]
+            idcc_mapping = extract_idcc_siret_mapping_from_ul(structure)
+            sirets.extend(idcc_mapping.get(idcc, []))
+        if sirets:
+            # Strip the brackets of the array
+            yield orjson.dumps(sirets)[1:-1]
+
+
+async def build_json_array(first_chunk, chunks):
+    yield b"["
+    if first_chunk is not None:
+        yield first_chunk
+        async for chunk in chunks:
+            yield b"," + chunk
+    yield b"]"
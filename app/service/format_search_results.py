@@ -1,21 +1,29 @@
+"""Formatting of search results, straight from the Elasticsearch documents to
+plain dicts ready to be serialized with orjson.
+
+Display fields computed at index time are read when the documents hold them,
+see `app.service.formatters.display_fields`. The responses are checked against
+the golden file of the formatter tests.
+"""
+
 import json
 
-from app.models.unite_legale import (
-    UniteLegaleResponse,
-)
 from app.service.formatters.bilan_financier import format_bilan
 from app.service.formatters.complements import format_complements
 from app.service.formatters.dirigeants import format_dirigeants
+from app.service.formatters.display_fields import (
+    get_display_field,
+    get_display_fields,
+)
 from app.service.formatters.etablissements import (
+    ETABLISSEMENT_FIELDS,
     format_etablissements_list,
     format_siege,
 )
 from app.service.formatters.immatriculation import format_immatriculation
 from app.service.formatters.nature_juridique import format_nature_juridique
 from app.service.formatters.nom_complet import format_nom_complet, get_nom_commercial
-from app.service.formatters.non_diffusible import (
-    hide_non_diffusible_fields,
-)
+from app.service.formatters.non_diffusible import hide_non_diffusible_fields
 from app.utils.helpers import (
     create_admin_fields_to_include,
     create_fields_to_include,
@@ -23,8 +31,48 @@ from app.utils.helpers import (
     is_dev_env,
 )
 
+# Fields of formatted unités légales, in order
+UNITE_LEGALE_FIELDS = (
+    "siren",
+    "nom_complet",
+    "nom_raison_sociale",
+    "sigle",
+    "nombre_etablissements",
+    "nombre_etablissements_ouverts",
+    "siege",
+    "activite_principale",
+    "categorie_entreprise",
+    "caractere_employeur",
+    "annee_categorie_entreprise",
+    "date_creation",
+    "date_fermeture",
+    "date_mise_a_jour",
+    "date_mise_a_jour_insee",
+    "date_mise_a_jour_rne",
+    "dirigeants",
+    "etat_administratif",
+    "nature_juridique",
+    "section_activite_principale",
+    "tranche_effectif_salarie",
+    "annee_tranche_effectif_salarie",
+    "statut_diffusion",
+    "matching_etablissements",
+    "etablissements",
+    "immatriculation",
+    "finances",
+    "complements",
+    "score",
+    "slug",
+    "meta",
+)
+
 
-def format_single_unite_legale(result, search_params):
+def format_single_unite_legale(result, search_params, fields_to_include=None) -> dict:
+    """Format a search result as a plain dict, ready to be serialized.
+
+    `fields_to_include` can be given when formatting several results of the
+    same search, it is computed from `search_params` otherwise.
+    """
     result_unite_legale = result["unite_legale"]
 
     def get_field(field, default=None):
@@ -33,9 +81,13 @@ def format_single_unite_legale(result, search_params):
             return default
         return value
 
-    unite_legale_fields = {
+    display_fields = get_display_fields(result_unite_legale)
+    formatted_unite_legale = {
         "siren": get_field("siren"),
-        "nom_complet": format_nom_complet(
+        "nom_complet": get_display_field(
+            display_fields,
+            "nom_complet",
+            format_nom_complet,
             get_field("nom_complet"),
             get_field("sigle"),
             get_nom_commercial(get_field("siege")),
@@ -67,75 +119,97 @@ def format_single_unite_legale(result, search_params):
         "annee_tranche_effectif_salarie": get_field("annee_tranche_effectif_salarie"),
         "statut_diffusion": get_field("statut_diffusion_unite_legale"),
     }
-    formatted_unite_legale = UniteLegaleResponse(**unite_legale_fields)
-
-    # Some search parameters control fields included in api response
-    fields_to_include = create_fields_to_include(
-        search_params
-    ) + create_admin_fields_to_include(search_params)
 
+    if fields_to_include is None:
+        fields_to_include = get_fields_to_include(search_params)
     for field in fields_to_include:
         if field == "SIEGE":
-            siege = format_siege(get_field("siege"))
-            formatted_unite_legale.siege = siege
+            formatted_unite_legale["siege"] = format_siege(get_field("siege"))
         elif field == "DIRIGEANTS":
-            dirigeants = format_dirigeants(
+            formatted_unite_legale["dirigeants"] = format_dirigeants(
                 get_field("dirigeants_pp"),
                 get_field("dirigeants_pm"),
             )
-            formatted_unite_legale.dirigeants = dirigeants
         elif field == "FINANCES":
-            finances = format_bilan(get_field("bilan_financier"))
-            formatted_unite_legale.finances = finances
+            formatted_unite_legale["finances"] = format_bilan(
+                get_field("bilan_financier")
+            )
         elif field == "COMPLEMENTS":
-            complements = format_complements(result_unite_legale)
-            formatted_unite_legale.complements = complements
-        elif field == "MATCHING_ETABLISSEMENTS":
-            matching_etablissements = format_etablissements_list(
-                get_value(result, "matching_etablissements")
+            formatted_unite_legale["complements"] = format_complements(
+                result_unite_legale
             )
-            formatted_unite_legale.matching_etablissements = matching_etablissements
+        elif field == "MATCHING_ETABLISSEMENTS":
+            formatted_unite_legale[
+                "matching_etablissements"
+            ] = format_etablissements_list(get_value(result, "matching_etablissements"))
         elif field == "SLUG":
-            slug = get_field("slug")
-            formatted_unite_legale.slug = slug
+            formatted_unite_legale["slug"] = get_field("slug")
         elif field == "ETABLISSEMENTS":
-            etablissements = format_etablissements_list(get_field("etablissements"))
-            formatted_unite_legale.etablissements = etablissements
+            formatted_unite_legale["etablissements"] = format_etablissements_list(
+                get_field("etablissements")
+            )
         elif field == "IMMATRICULATION":
-            immatriculation = format_immatriculation(get_field("immatriculation"))
-            formatted_unite_legale.immatriculation = immatriculation
+            formatted_unite_legale["immatriculation"] = format_immatriculation(
+                get_field("immatriculation")
+            )
         elif field == "SCORE":
-            score = result.get("meta")["score"]
-            formatted_unite_legale.score = score
+            formatted_unite_legale["score"] = result.get("meta")["score"]
 
     # Include search score and tree field for dev environment
     if is_dev_env():
         meta = result.get("meta")
-        formatted_unite_legale.meta = json.loads(json.dumps(meta, default=str))
+        formatted_unite_legale["meta"] = json.loads(json.dumps(meta, default=str))
+
+    formatted_unite_legale = {
+        field: formatted_unite_legale[field]
+        for field in UNITE_LEGALE_FIELDS
+        if field in formatted_unite_legale
+    }
 
     # Hide most fields if unité légale is non-diffusible
-    is_non_diffusible = (
-        True
-        if result_unite_legale.get("statut_diffusion_unite_legale") == "P"
-        else False
+    if result_unite_legale.get("statut_diffusion_unite_legale") == "P":
+        return hide_non_diffusible_fields(formatted_unite_legale)
+    return formatted_unite_legale
+
+
+def get_fields_to_include(search_params) -> list[str]:
+    return create_fields_to_include(search_params) + create_admin_fields_to_include(
+        search_params
     )
-    if is_non_diffusible:
-        formatted_unite_legale = hide_non_diffusible_fields(
-            formatted_unite_legale.dict(exclude_unset=True)
-        )
-        return formatted_unite_legale
 
-    # `exclude_unset`` option hides fields which were not
-    # explicitly set when creating response object
+
+def order_etablissements_fields(formatted_unite_legale) -> dict:
+    """Put the fields of the établissements lists back in order.
+
+    `hide_non_diffusible_etablissement_fields` adds back some of the fields
+    hidden from the lists of non-diffusible unités légales : in `/search`
+    responses, they are put back in place.
+    """
+    for field in ("matching_etablissements", "etablissements"):
+        etablissements = formatted_unite_legale.get(field)
+        if etablissements:
+            formatted_unite_legale[field] = [
+                {
+                    etablissement_field: etablissement[etablissement_field]
+                    for etablissement_field in ETABLISSEMENT_FIELDS
+                    if etablissement_field in etablissement
+                }
+                for etablissement in etablissements
+            ]
     return formatted_unite_legale
 
 
-def format_search_results(results, search_params):
+def format_search_results(results, search_params) -> list[dict]:
     """Main formatting function for all results."""
+    fields_to_include = get_fields_to_include(search_params)
     formatted_results = []
     for result in results:
-        # If structure is unite légale
-        if "unite_legale" in result:
-            formatted_result = format_single_unite_legale(result, search_params)
-            formatted_results.append(formatted_result)
+        if "unite_legale" not in result:
+            continue
+        formatted_result = format_single_unite_legale(
+            result, search_params, fields_to_include
+        )
+        if result["unite_legale"].get("statut_diffusion_unite_legale") == "P":
+            formatted_result = order_etablissements_fields(formatted_result)
+        formatted_results.append(formatted_result)
     return formatted_results
@@ -1,13 +1,13 @@
-from app.models.unite_legale import Finances
+from app.utils.helpers import convert_to_int
 
 
 def format_bilan(source_bilan):
     if source_bilan:
         formatted_bilan = {
-            source_bilan.get("annee_cloture_exercice"): Finances(
-                ca=source_bilan.get("ca"),
-                resultat_net=source_bilan.get("resultat_net"),
-            )
+            source_bilan.get("annee_cloture_exercice"): {
+                "ca": convert_to_int(source_bilan.get("ca")),
+                "resultat_net": convert_to_int(source_bilan.get("resultat_net")),
+            }
         }
         return formatted_bilan
     return None
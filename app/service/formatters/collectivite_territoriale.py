@@ -1,4 +1,3 @@
-from app.models.unite_legale import CollectiviteTerritoriale
 from app.service.formatters.elus import format_elus
 
 
@@ -11,9 +10,9 @@ def format_collectivite_territoriale(
     if colter_code is None:
         return None
     else:
-        return CollectiviteTerritoriale(
-            code=colter_code,
-            code_insee=colter_code_insee,
-            elus=format_elus(colter_elus),  # Format elus if provided
-            niveau=colter_niveau,
-        ).dict()
+        return {
+            "code": colter_code,
+            "code_insee": colter_code_insee,
+            "elus": format_elus(colter_elus),  # Format elus if provided
+            "niveau": colter_niveau,
+        }
@@ -1,5 +1,7 @@
 import json
 
+from app.service.formatters.display_fields import get_display_fields
+
 
 def extract_idcc_siret_mapping_from_ul(ul_result):
     """
@@ -15,7 +17,11 @@ def extract_idcc_siret_mapping_from_ul(ul_result):
         (list of str) associated with the given SIREN. Returns an empty dictionary
         if no IDCCs are found or if parsing fails.
     """
-    idcc_siret_mapping = ul_result["unite_legale"]["sirets_par_idcc"]
+    display_fields = get_display_fields(ul_result["unite_legale"])
+    if "sirets_par_idcc" in display_fields:
+        return display_fields["sirets_par_idcc"]
+
+    idcc_siret_mapping = ul_result["unite_legale"].get("sirets_par_idcc")
 
     if idcc_siret_mapping:
         # Replace single quotes with double quotes to form valid JSON
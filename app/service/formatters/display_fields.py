@@ -0,0 +1,35 @@
+"""Display fields computed when the documents are indexed.
+
+Documents may hold, under `display`, the values some formatters would compute
+from their other fields. They are versioned, `DISPLAY_FIELDS_VERSION` being
+the version of the contract below, and read instead of running the formatters
+only when their version matches : documents indexed without them, or with
+another version, are formatted as before.
+
+Display fields of version 1 :
+- `unite_legale.display.nom_complet` : `format_nom_complet` of the unité légale
+- `unite_legale.display.type_siae` : `string_list_to_string` of `type_siae`
+- `unite_legale.display.sirets_par_idcc` : `sirets_par_idcc` as an object,
+  mapping each IDCC to its SIRETs
+- `display.liste_enseignes` of établissements : `format_enseignes` of their
+  `enseigne_1`, `enseigne_2` and `enseigne_3`
+"""
+
+DISPLAY_FIELDS_VERSION = 1
+
+
+def get_display_fields(source) -> dict:
+    """Display fields of an unité légale or établissement document, empty if it
+    has none of the current version."""
+    display_fields = source.get("display") if source else None
+    if display_fields and display_fields.get("version") == DISPLAY_FIELDS_VERSION:
+        return display_fields
+    return {}
+
+
+def get_display_field(display_fields, field, format_field, *args):
+    """Display field if it was computed at index time, otherwise
+    `format_field(*args)`."""
+    if field in display_fields:
+        return display_fields[field]
+    return format_field(*args)
@@ -1,4 +1,3 @@
-from app.models.unite_legale import Elu
 from app.utils.helpers import convert_to_year_month, get_value
 
 
@@ -12,12 +11,12 @@ def format_elus(elus=None):
                 else None
             )
 
-            formatted_elu = Elu(
-                nom=get_value(elu, "nom"),
-                prenoms=get_value(elu, "prenom"),
-                annee_de_naissance=annee_de_naissance,
-                fonction=get_value(elu, "fonction"),
-                sexe=get_value(elu, "sexe"),
-            )
-            formatted_elus.append(formatted_elu.dict())
+            formatted_elu = {
+                "nom": get_value(elu, "nom"),
+                "prenoms": get_value(elu, "prenom"),
+                "annee_de_naissance": annee_de_naissance,
+                "fonction": get_value(elu, "fonction"),
+                "sexe": get_value(elu, "sexe"),
+            }
+            formatted_elus.append(formatted_elu)
     return formatted_elus
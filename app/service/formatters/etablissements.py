@@ -1,12 +1,86 @@
-from app.models.unite_legale import Etablissement
+from app.service.formatters.display_fields import (
+    get_display_field,
+    get_display_fields,
+)
 from app.service.formatters.enseignes import format_enseignes
 from app.service.formatters.non_diffusible import (
     hide_non_diffusible_etablissement_fields,
 )
 from app.utils.helpers import get_value
 
+# Fields of formatted établissements, in order
+ETABLISSEMENT_FIELDS = (
+    "activite_principale",
+    "activite_principale_registre_metier",
+    "ancien_siege",
+    "annee_tranche_effectif_salarie",
+    "adresse",
+    "caractere_employeur",
+    "cedex",
+    "code_pays_etranger",
+    "code_postal",
+    "commune",
+    "complement_adresse",
+    "coordonnees",
+    "date_creation",
+    "date_debut_activite",
+    "date_fermeture",
+    "date_mise_a_jour",
+    "date_mise_a_jour_insee",
+    "departement",
+    "distribution_speciale",
+    "epci",
+    "est_siege",
+    "etat_administratif",
+    "geo_adresse",
+    "geo_id",
+    "indice_repetition",
+    "latitude",
+    "libelle_cedex",
+    "libelle_commune",
+    "libelle_commune_etranger",
+    "libelle_pays_etranger",
+    "libelle_voie",
+    "liste_enseignes",
+    "liste_finess",
+    "liste_id_bio",
+    "liste_idcc",
+    "liste_id_organisme_formation",
+    "liste_rge",
+    "liste_uai",
+    "longitude",
+    "nom_commercial",
+    "numero_voie",
+    "region",
+    "siret",
+    "statut_diffusion_etablissement",
+    "tranche_effectif_salarie",
+    "type_voie",
+)
+
+# Fields hidden from établissements lists, to avoid bulky responses
+ETABLISSEMENTS_LIST_HIDDEN_FIELDS = (
+    "activite_principale_registre_metier",
+    "coordonnees",
+    "cedex",
+    "code_pays_etranger",
+    "complement_adresse",
+    "date_mise_a_jour",
+    "date_mise_a_jour_insee",
+    "departement",
+    "distribution_speciale",
+    "geo_adresse",
+    "indice_repetition",
+    "libelle_cedex",
+    "libelle_commune_etranger",
+    "libelle_pays_etranger",
+    "libelle_voie",
+    "numero_voie",
+    "type_voie",
+)
+
 
-def format_etablissement(source_etablissement):
+def format_etablissement(source_etablissement) -> dict:
     def get_field(field, default=None):
         return get_value(source_etablissement, field, default)
 
@@ -15,8 +89,8 @@ def format_etablissement(source_etablissement):
         "activite_principale_registre_metier": get_field(
             "activite_principale_registre_metier"
         ),
-        "annee_tranche_effectif_salarie": get_field("annee_tranche_effectif_salarie"),
         "ancien_siege": get_field("ancien_siege"),
+        "annee_tranche_effectif_salarie": get_field("annee_tranche_effectif_salarie"),
         "adresse": get_field("adresse"),
         "caractere_employeur": get_field("caractere_employeur"),
         "cedex": get_field("cedex"),
@@ -44,12 +118,15 @@ def format_etablissement(source_etablissement):
         "libelle_commune_etranger": get_field("libelle_commune_etranger"),
         "libelle_pays_etranger": get_field("libelle_pays_etranger"),
         "libelle_voie": get_field("libelle_voie"),
-        "liste_enseignes": format_enseignes(
+        "liste_enseignes": get_display_field(
+            get_display_fields(source_etablissement),
+            "liste_enseignes",
+            format_enseignes,
             [
                 get_field("enseigne_1"),
                 get_field("enseigne_2"),
                 get_field("enseigne_3"),
-            ]
+            ],
         ),
         "liste_finess": get_field("liste_finess"),
         "liste_id_bio": get_field("liste_id_bio"),
@@ -66,53 +143,24 @@ def format_etablissement(source_etablissement):
         "tranche_effectif_salarie": get_field("tranche_effectif_salarie"),
         "type_voie": get_field("type_voie"),
     }
-
-    is_non_diffusible = (
-        True if get_field("statut_diffusion_etablissement") == "P" else False
-    )
-
-    if is_non_diffusible:
-        formatted_etablissement = hide_non_diffusible_etablissement_fields(
-            formatted_etablissement
-        )
-
-    return Etablissement(**formatted_etablissement)
+    if get_field("statut_diffusion_etablissement") == "P":
+        hide_non_diffusible_etablissement_fields(formatted_etablissement)
+    return formatted_etablissement
 
 
-def format_etablissements_list(etablissements=None):
-    hidden_fields = [
-        "activite_principale_registre_metier",
-        "coordonnees",
-        "cedex",
-        "code_pays_etranger",
-        "complement_adresse",
-        "date_mise_a_jour",
-        "date_mise_a_jour_insee",
-        "departement",
-        "distribution_speciale",
-        "geo_adresse",
-        "indice_repetition",
-        "libelle_cedex",
-        "libelle_commune_etranger",
-        "libelle_pays_etranger",
-        "libelle_voie",
-        "numero_voie",
-        "type_voie",
-    ]
+def format_etablissements_list(etablissements=None) -> list[dict]:
     etablissements_formatted = []
-    if etablissements:
-        for etablissement in etablissements:
-            etablissement_formatted = format_etablissement(etablissement).dict()
-            # Hide certain fields from response to avoid bulky response
-            for field in hidden_fields:
-                del etablissement_formatted[field]
-            etablissements_formatted.append(Etablissement(**etablissement_formatted))
+    for etablissement in etablissements or []:
+        etablissement_formatted = format_etablissement(etablissement)
+        for field in ETABLISSEMENTS_LIST_HIDDEN_FIELDS:
+            del etablissement_formatted[field]
+        etablissements_formatted.append(etablissement_formatted)
     return etablissements_formatted
 
 
-def format_siege(siege=None):
+def format_siege(siege=None) -> dict:
     if not siege:
         return {}
-    siege_formatted = format_etablissement(siege).dict()
+    siege_formatted = format_etablissement(siege)
     del siege_formatted["ancien_siege"]
-    return Etablissement(**siege_formatted)
+    return siege_formatted
@@ -1,8 +1,7 @@
 import json
 
 from app.labels.helpers import NATURES_ENTREPRISES
-from app.models.unite_legale import Immatriculation
-from app.utils.helpers import convert_date_to_iso
+from app.utils.helpers import convert_date_to_iso, convert_to_float, convert_to_int
 
 
 def format_immatriculation(immatriculation):
@@ -13,18 +12,24 @@ def format_immatriculation(immatriculation):
         return None
 
     else:
-        return Immatriculation(
-            date_debut_activite=convert_date_to_iso(get_field("date_debut_activite")),
-            date_immatriculation=convert_date_to_iso(get_field("date_immatriculation")),
-            date_radiation=convert_date_to_iso(get_field("date_radiation")),
-            duree_personne_morale=get_field("duree_personne_morale"),
-            nature_entreprise=format_nature_entreprise(get_field("nature_entreprise")),
-            date_cloture_exercice=(get_field("date_cloture_exercice")),
-            capital_social=get_field("capital_social"),
-            capital_variable=get_field("capital_variable"),
-            devise_capital=get_field("devise_capital"),
-            indicateur_associe_unique=get_field("indicateur_associe_unique"),
-        ).dict()
+        return {
+            "date_debut_activite": convert_date_to_iso(
+                get_field("date_debut_activite")
+            ),
+            "date_immatriculation": convert_date_to_iso(
+                get_field("date_immatriculation")
+            ),
+            "date_radiation": convert_date_to_iso(get_field("date_radiation")),
+            "duree_personne_morale": convert_to_int(get_field("duree_personne_morale")),
+            "nature_entreprise": format_nature_entreprise(
+                get_field("nature_entreprise")
+            ),
+            "date_cloture_exercice": get_field("date_cloture_exercice"),
+            "capital_social": convert_to_float(get_field("capital_social")),
+            "capital_variable": get_field("capital_variable"),
+            "devise_capital": get_field("devise_capital"),
+            "indicateur_associe_unique": get_field("indicateur_associe_unique"),
+        }
 
 
 def format_nature_entreprise(nature_entreprise):
@@ -1,25 +1,18 @@
-from datetime import timedelta
-
-from fastapi.responses import JSONResponse
+from functools import lru_cache
 
 from app.config import settings
-from app.utils.cache import cache_strategy
-from app.utils.helpers import fetch_json_from_url
-
-
-def should_cache_for_how_long():
-    return timedelta(hours=24)
+from app.utils.metadata_document import MetadataDocument
 
 
-def get_updates_json():
-    return fetch_json_from_url(str(settings.metadata.url_updates_json))
+@lru_cache
+def get_updates_document() -> MetadataDocument:
+    return MetadataDocument(
+        "updates_json",
+        str(settings.metadata.url_updates_json),
+        settings.metadata.refresh_interval,
+        settings.metadata.retry_interval,
+    )
 
 
-def get_last_modified_response():
-    cache_key = "updates_json"
-    json_content = cache_strategy(
-        cache_key,
-        get_updates_json,
-        should_cache_for_how_long,
-    )
-    return JSONResponse(json_content)
+async def get_last_modified_response(request):
+    return await get_updates_document().get_response(request)
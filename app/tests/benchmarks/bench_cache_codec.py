@@ -0,0 +1,119 @@
+"""Micro-benchmark of the cache serialization of search results.
+
+Compares the former `json.dumps`/`json.loads` path with `cache_codec`, on
+synthetic `es_search_results` payloads shaped like the cached ones :
+
+    python -m app.tests.benchmarks.bench_cache_codec
+"""
+import json
+import timeit
+
+from app.config import settings
+from app.utils import cache_codec
+
+
+def build_etablissement(siren, index):
+    return {
+        "siret": f"{siren}{index:05d}",
+        "activite_principale": "62.01Z",
+        "adresse": f"{index} RUE DE LA REPUBLIQUE 75001 PARIS",
+        "code_postal": "75001",
+        "commune": "75101",
+        "date_creation": "2001-01-01",
+        "departement": "75",
+        "est_siege": index == 0,
+        "etat_administratif": "A",
+        "latitude": "48.862725",
+        "longitude": "2.287592",
+        "libelle_commune": "PARIS 1",
+        "liste_idcc": ["1486"],
+        "region": "11",
+        "statut_diffusion_etablissement": "O",
+        "tranche_effectif_salarie": "11",
+    }
+
+
+def build_structure(siren, nombre_etablissements, with_etablissements):
+    etablissements = [
+        build_etablissement(siren, index) for index in range(nombre_etablissements)
+    ]
+    unite_legale = {
+        "siren": siren,
+        "nom_complet": "societe de test",
+        "nom_raison_sociale": "SOCIETE DE TEST",
+        "activite_principale_unite_legale": "62.01Z",
+        "nature_juridique_unite_legale": "5710",
+        "nombre_etablissements": nombre_etablissements,
+        "nombre_etablissements_ouverts": nombre_etablissements,
+        "siege": etablissements[0],
+        "dirigeants_pp": [
+            {"nom": "DUPONT", "prenoms": "JEAN", "date_de_naissance": "1970-05"}
+        ],
+        "bilan_financier": {"annee_cloture_exercice": "2022", "ca": 1000000},
+        "sirets_par_idcc": str({"1486": [e["siret"] for e in etablissements]}),
+    }
+    if with_etablissements:
+        unite_legale["etablissements"] = etablissements
+    return {
+        "identifiant": siren,
+        "unite_legale": unite_legale,
+        "meta": {"id": f"{siren}-0", "score": 12.5},
+        "matching_etablissements": etablissements[:10],
+    }
+
+
+def build_es_search_results(per_page, nombre_etablissements, with_etablissements):
+    return {
+        "total_results": 10000,
+        "response": [
+            build_structure(
+                f"{356000000 + index:09d}", nombre_etablissements, with_etablissements
+            )
+            for index in range(per_page)
+        ],
+        "execution_time": 450,
+    }
+
+
+PAYLOADS = {
+    "default (10 results)": build_es_search_results(10, 10, False),
+    "per_page=25": build_es_search_results(25, 10, False),
+    "include_admin=etablissements": build_es_search_results(25, 100, True),
+}
+
+
+def time_per_call(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(number=50):
+    print(
+        f"{'payload':<30}{'codec':<14}{'size (B)':>12}{'dump (µs)':>12}"
+        f"{'load (µs)':>12}"
+    )
+    for payload_name, payload in PAYLOADS.items():
+        serialised_json = json.dumps(payload, default=str)
+        results = {
+            "json": (
+                len(serialised_json.encode("utf-8")),
+                time_per_call(lambda: json.dumps(payload, default=str), number),
+                time_per_call(lambda: json.loads(serialised_json), number),
+            )
+        }
+        for compression in ["none", *cache_codec.COMPRESSIONS]:
+            settings.cache.compression = compression
+            encoded_value, _ = cache_codec.encode(payload)
+            results[f"orjson+{compression}"] = (
+                len(encoded_value),
+                time_per_call(lambda: cache_codec.encode(payload), number),
+                time_per_call(lambda: cache_codec.decode(encoded_value), number),
+            )
+        for codec_name, (size, dump_time, load_time) in results.items():
+            print(
+                f"{payload_name:<30}{codec_name:<14}{size:>12}{dump_time:>12.0f}"
+                f"{load_time:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Micro-benchmark of the formatting of search results, up to the response body.
+
+Times `format_search_results` followed by the serialization of the results
+with orjson, on the unités légales of the golden file of the formatter tests :
+
+    python -m app.tests.benchmarks.bench_formatters
+"""
+import copy
+import timeit
+from pathlib import Path
+
+import orjson
+
+from app.controller.search_params_model import SearchParams
+from app.service.format_search_results import format_search_results
+
+SOURCES_PATH = (
+    Path(__file__).parents[1] / "unit_tests" / "golden" / "search_results_sources.json"
+)
+
+SEARCH_PARAMS = {
+    "default": {"terms": "la poste"},
+    "minimal": {"terms": "la poste", "minimal": "true"},
+    "include_admin": {
+        "terms": "la poste",
+        "include_admin": "etablissements,slug,immatriculation",
+    },
+}
+
+RESULTS = {
+    "per_page=10": (10, 2),
+    "per_page=25": (25, 2),
+    "25 x 100 matching": (25, 100),
+}
+
+
+def build_results(per_page, matching_size):
+    sources = orjson.loads(SOURCES_PATH.read_bytes())
+    results = []
+    for index in range(per_page):
+        result = copy.deepcopy(sources[index % len(sources)])
+        matching_etablissement = sources[0]["matching_etablissements"][0]
+        result["matching_etablissements"] = [matching_etablissement] * matching_size
+        results.append(result)
+    return results
+
+
+def format_results(results, search_params):
+    return orjson.dumps(
+        {"results": format_search_results(results, search_params)},
+        option=orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def time_per_call(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(number=50):
+    print(f"{'results':<20}{'params':<16}{'time (µs)':>12}")
+    for results_name, (per_page, matching_size) in RESULTS.items():
+        results = build_results(per_page, matching_size)
+        for params_name, params in SEARCH_PARAMS.items():
+            search_params = SearchParams(**params)
+            format_time = time_per_call(
+                lambda: format_results(results, search_params), number
+            )
+            print(f"{results_name:<20}{params_name:<16}{format_time:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
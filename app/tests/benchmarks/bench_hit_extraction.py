@@ -0,0 +1,139 @@
+"""Micro-benchmark of the extraction of structures from a search response.
+
+Compares the former extraction from `elasticsearch_dsl` hits, converted back
+to dicts with `to_dict()`, with `extract_ul_and_etab_from_hit` on the raw
+response body :
+
+    python -m app.tests.benchmarks.bench_hit_extraction
+"""
+import timeit
+
+from elasticsearch_dsl import Search
+
+from app.elastic.helpers.helpers import extract_ul_and_etab_from_hit
+
+
+def build_etablissement(siren, index):
+    return {
+        "siret": f"{siren}{index:05d}",
+        "activite_principale": "62.01Z",
+        "adresse": f"{index} RUE DE LA REPUBLIQUE 75001 PARIS",
+        "code_postal": "75001",
+        "commune": "75101",
+        "est_siege": index == 0,
+        "etat_administratif": "A",
+        "liste_idcc": ["1486"],
+        "statut_diffusion_etablissement": "O",
+    }
+
+
+def build_hit(siren, matching_size):
+    return {
+        "_index": "siren-reader",
+        "_type": "_doc",
+        "_id": f"{siren}-0",
+        "_score": 12.5,
+        "sort": [12.5, "A", 10],
+        "_source": {
+            "identifiant": siren,
+            "unite_legale": {
+                "siren": siren,
+                "nom_complet": "societe de test",
+                "siege": build_etablissement(siren, 0),
+                "dirigeants_pp": [{"nom": "DUPONT", "prenoms": "JEAN"}],
+            },
+        },
+        "inner_hits": {
+            "unite_legale.etablissements": {
+                "hits": {
+                    "total": {"value": matching_size, "relation": "eq"},
+                    "hits": [
+                        {
+                            "_index": "siren-reader",
+                            "_id": f"{siren}-0",
+                            "_nested": {
+                                "field": "unite_legale.etablissements",
+                                "offset": index,
+                            },
+                            "_score": 1.0,
+                            "_source": build_etablissement(siren, index),
+                        }
+                        for index in range(matching_size)
+                    ],
+                }
+            }
+        },
+    }
+
+
+def build_response(per_page, matching_size):
+    return {
+        "took": 12,
+        "hits": {
+            "total": {"value": 10000, "relation": "gte"},
+            "hits": [
+                build_hit(f"{356000000 + index:09d}", matching_size)
+                for index in range(per_page)
+            ],
+        },
+    }
+
+
+def extract_with_dsl(raw_response):
+    """Former extraction, from the hits of an `elasticsearch_dsl` response."""
+    structures = []
+    for structure in Search()._response_class(Search(), raw_response).hits:
+        structure_dict = structure.to_dict()
+        structure_dict["meta"] = structure.meta.to_dict()
+        try:
+            matching_etablissements = structure_dict["meta"]["inner_hits"][
+                "unite_legale.etablissements"
+            ]["hits"]["hits"]
+            structure_dict["matching_etablissements"] = [
+                matching_etablissement["_source"].to_dict()
+                for matching_etablissement in matching_etablissements
+            ]
+        except Exception:
+            structure_dict["matching_etablissements"] = []
+        structures.append(structure_dict)
+    return structures
+
+
+def extract_raw(raw_response):
+    return [extract_ul_and_etab_from_hit(hit) for hit in raw_response["hits"]["hits"]]
+
+
+RESPONSES = {
+    "default (10 x 10)": (10, 10),
+    "per_page=25 (25 x 10)": (25, 10),
+    "25 x 100 matching": (25, 100),
+}
+
+
+def time_per_call(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(number=50):
+    print(f"{'response':<26}{'dsl (µs)':>12}{'raw (µs)':>12}")
+    for response_name, (per_page, matching_size) in RESPONSES.items():
+        # Both extractions modify the response, which is built for each call
+        build_time = time_per_call(
+            lambda: build_response(per_page, matching_size), number
+        )
+        dsl_time = time_per_call(
+            lambda: extract_with_dsl(build_response(per_page, matching_size)),
+            number,
+        )
+        raw_time = time_per_call(
+            lambda: extract_raw(build_response(per_page, matching_size)),
+            number,
+        )
+        print(
+            f"{response_name:<26}{dsl_time - build_time:>12.0f}"
+            f"{raw_time - build_time:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
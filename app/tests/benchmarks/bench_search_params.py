@@ -0,0 +1,68 @@
+"""Micro-benchmark of the per-request CPU time spent on search parameters.
+
+Times the validation of the request parameters, and the building and
+serialization of the Elasticsearch query, whose size is also reported :
+
+    python -m app.tests.benchmarks.bench_search_params
+"""
+import timeit
+
+import orjson
+
+from app.controller.search_params_builder import SearchParamsBuilder
+from app.controller.search_params_model import SearchParams
+from app.elastic.es_search_runner import ElasticSearchRunner
+from app.service.search_type import SearchType
+
+QUERY_PARAMS = {
+    "terms": {"q": "la poste"},
+    "terms and filters": {
+        "q": "boulangerie",
+        "departement": "75,92",
+        "est_rge": "true",
+        "categorie_entreprise": "PME",
+        "ca_min": "100000",
+    },
+    "filters only": {
+        "convention_collective_renseignee": "true",
+        "id_convention_collective": "1486",
+        "section_activite_principale": "J",
+        "etat_administratif": "A",
+    },
+    "person": {"nom_personne": "dupont", "prenoms_personne": "jean"},
+    "geo": {"lat": "48.86", "long": "2.34", "radius": "1", "code_postal": "75001"},
+}
+
+
+def build_search_params(query_params) -> SearchParams:
+    return SearchParams(**SearchParamsBuilder.map_parameters(query_params))
+
+
+def build_query(search_params, search_type) -> dict:
+    es_search_builder = ElasticSearchRunner(search_params, search_type)
+    es_search_builder.build_es_search_query()
+    return es_search_builder.es_search_client.to_dict()
+
+
+def time_per_call(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(number=500):
+    print(f"{'search':<20}{'params (µs)':>14}{'query (µs)':>14}{'body (B)':>12}")
+    for search_name, query_params in QUERY_PARAMS.items():
+        search_type = SearchType.GEO if "lat" in query_params else SearchType.TEXT
+        search_params = build_search_params(query_params)
+        params_time = time_per_call(lambda: build_search_params(query_params), number)
+        query_time = time_per_call(
+            lambda: build_query(search_params, search_type), number
+        )
+        body_size = len(orjson.dumps(build_query(search_params, search_type)))
+        print(
+            f"{search_name:<20}{params_time:>14.0f}{query_time:>14.0f}"
+            f"{body_size:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import pytest
+
+from app.controller.search_params_model import SearchParams
+
+
+def test_active_params_hold_parameters_which_are_not_none():
+    search_params = SearchParams(terms="la poste", departement="75", est_rge="false")
+    active_params = search_params.active_params
+    assert active_params["terms"] == "LA POSTE"
+    assert active_params["departement"] == ["75"]
+    assert active_params["est_rge"] is False
+    assert "est_bio" not in active_params
+    assert active_params == {
+        field_name: field_value
+        for field_name, field_value in search_params.dict().items()
+        if field_value is not None
+    }
+
+
+def test_active_params_are_read_only():
+    search_params = SearchParams(terms="la poste")
+    with pytest.raises(TypeError):
+        search_params.active_params["terms"] = "autre"
@@ -0,0 +1,38 @@
+import pytest
+
+from app.exceptions.exceptions import InvalidParamError
+from app.service.build_batch_api_response import format_error, get_search_params
+
+
+def test_search_params_are_validated_as_query_params():
+    per_page = 5
+    search_params = get_search_params(
+        {
+            "q": "la poste",
+            "departement": ["92", "75"],
+            "est_ess": True,
+            "per_page": per_page,
+        }
+    )
+    assert search_params.terms == "LA POSTE"
+    assert search_params.departement == ["92", "75"]
+    assert search_params.est_ess is True
+    assert search_params.per_page == per_page
+
+
+def test_null_params_are_absent():
+    search_params = get_search_params(
+        {"q": "la poste", "departement": None, "nom_personne": None}
+    )
+    assert search_params.departement is None
+    assert search_params.nom_personne is None
+
+
+def test_search_must_be_an_object():
+    with pytest.raises(InvalidParamError):
+        get_search_params(["la poste"])
+
+
+def test_errors_have_the_api_error_body():
+    error = format_error(InvalidParamError("Paramètre invalide."))
+    assert error == {"erreur": "Paramètre invalide.", "status_code": 400}
@@ -0,0 +1,46 @@
+import json
+
+from app.config import settings
+from app.utils import cache_codec
+
+VALUE = {
+    "total_results": 1,
+    "response": [{"unite_legale": {"siren": "356000000", "nom_complet": "la poste"}}],
+    "execution_time": 12,
+}
+
+
+def test_small_values_are_not_compressed():
+    encoded_value, size = cache_codec.encode(VALUE)
+    assert encoded_value[0] == cache_codec.FORMAT_JSON
+    assert size == len(encoded_value) - 1
+    assert cache_codec.decode(encoded_value) == (VALUE, size)
+
+
+def test_large_values_are_compressed(monkeypatch):
+    monkeypatch.setattr(settings.cache, "compression", "zlib")
+    monkeypatch.setattr(settings.cache, "compression_threshold", 10)
+    encoded_value, size = cache_codec.encode(VALUE)
+    assert encoded_value[0] == cache_codec.FORMAT_JSON_ZLIB
+    assert cache_codec.decode(encoded_value) == (VALUE, size)
+
+
+def test_compression_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(settings.cache, "compression", "none")
+    monkeypatch.setattr(settings.cache, "compression_threshold", 10)
+    encoded_value, _ = cache_codec.encode(VALUE)
+    assert encoded_value[0] == cache_codec.FORMAT_JSON
+
+
+def test_plain_json_values_are_still_decoded():
+    encoded_value = json.dumps(VALUE).encode("utf-8")
+    assert cache_codec.decode(encoded_value) == (VALUE, len(encoded_value))
+
+
+def test_bytes_are_stored_as_is(monkeypatch):
+    monkeypatch.setattr(settings.cache, "compression", "zlib")
+    monkeypatch.setattr(settings.cache, "compression_threshold", 10)
+    value = json.dumps(VALUE).encode("utf-8")
+    encoded_value, size = cache_codec.encode(value)
+    assert encoded_value[0] == cache_codec.FORMAT_BYTES_ZLIB
+    assert cache_codec.decode(encoded_value) == (value, size)
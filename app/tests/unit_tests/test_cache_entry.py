@@ -0,0 +1,32 @@
+import time
+from datetime import timedelta
+
+from app.utils.cache import (
+    CacheEntry,
+    CacheTimeToLive,
+    deserialise_cache_entry,
+    serialise_cache_entry,
+)
+
+
+def test_cache_entry_round_trip():
+    cache_entry = CacheEntry({"total_results": 1}, fresh_until=1700000000.0)
+    serialised_entry, _ = serialise_cache_entry(cache_entry)
+    assert deserialise_cache_entry(serialised_entry)[0] == cache_entry
+
+
+def test_value_cached_without_entry_is_always_fresh():
+    cache_entry, _ = deserialise_cache_entry(b'{"total_results": 1}')
+    assert cache_entry.value == {"total_results": 1}
+    assert cache_entry.is_fresh()
+
+
+def test_cache_entry_becomes_stale():
+    assert CacheEntry("value", fresh_until=time.time() + 60).is_fresh()
+    assert not CacheEntry("value", fresh_until=time.time() - 60).is_fresh()
+
+
+def test_max_age_includes_stale_period():
+    time_to_live = CacheTimeToLive(timedelta(hours=24), stale=timedelta(hours=2))
+    assert time_to_live.max_age == timedelta(hours=26)
+    assert CacheTimeToLive(timedelta(minutes=30)).max_age == timedelta(minutes=30)
@@ -0,0 +1,29 @@
+from app.controller.search_params_model import SearchParams
+from app.service.search_type import SearchType
+from app.utils.cache import build_search_cache_key
+
+
+def build_key(search_type=SearchType.TEXT, **params):
+    return build_search_cache_key(search_type, SearchParams(**params))
+
+
+def test_key_does_not_depend_on_filter_values_order():
+    assert build_key(terms="la poste", departement="75,92,75") == build_key(
+        terms="la poste", departement="92,75"
+    )
+
+
+def test_key_depends_on_filter_values():
+    assert build_key(departement="75,92") != build_key(departement="75")
+
+
+def test_key_depends_on_page():
+    assert build_key(terms="la poste", page="1") != build_key(
+        terms="la poste", page="2"
+    )
+
+
+def test_key_depends_on_search_type():
+    assert build_key(SearchType.TEXT, lat="48.8", lon="2.3") != build_key(
+        SearchType.GEO, lat="48.8", lon="2.3"
+    )
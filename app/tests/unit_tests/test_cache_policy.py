@@ -0,0 +1,58 @@
+import asyncio
+from datetime import timedelta
+
+from app.config import settings
+from app.utils.cache import CacheTimeToLive, cache_value
+from app.utils.cache_policy import CountMinSketch, get_search_time_to_live
+
+RESULTS = {"response": [{"unite_legale": {"siren": "356000000"}}]}
+
+
+def test_sketch_counts_keys():
+    sketch = CountMinSketch(width=1024, depth=4, window=1000)
+    requests = 4
+    for _ in range(requests - 1):
+        sketch.add("la poste")
+    assert sketch.add("la poste") == requests
+    assert sketch.estimate("la poste") == requests
+    assert sketch.estimate("boulangerie") == 0
+
+
+def test_sketch_halves_counts_after_window():
+    window = 10
+    sketch = CountMinSketch(width=1024, depth=4, window=window)
+    for _ in range(window - 1):
+        sketch.add("la poste")
+    assert sketch.add("la poste") == (window - 1) // 2 + 1
+
+
+def test_slow_searches_are_served_stale():
+    time_to_live = get_search_time_to_live(500, 1, is_lookup=False)
+    assert isinstance(time_to_live, CacheTimeToLive)
+    assert time_to_live.stale > timedelta(0)
+
+
+def test_fast_rare_searches_are_not_cached():
+    assert get_search_time_to_live(50, 1, is_lookup=False) == timedelta(0)
+
+
+def test_fast_popular_searches_are_cached_longer_when_hot():
+    popular_time_to_live = get_search_time_to_live(50, 40, is_lookup=False)
+    hot_time_to_live = get_search_time_to_live(50, 1000, is_lookup=False)
+    assert timedelta(0) < popular_time_to_live.fresh < hot_time_to_live.fresh
+
+
+def test_large_payloads_of_fast_searches_are_not_cached(monkeypatch):
+    cached_keys = []
+
+    class RedisClient:
+        async def set(self, key, value, time_to_live):
+            cached_keys.append(key)
+
+    monkeypatch.setattr(settings.cache_policy, "max_payload_size", 10)
+    time_to_live = get_search_time_to_live(50, 1000, is_lookup=False)
+    cache_entry = asyncio.run(
+        cache_value(RedisClient(), "large-payload", RESULTS, time_to_live)
+    )
+    assert cache_entry is None
+    assert cached_keys == []
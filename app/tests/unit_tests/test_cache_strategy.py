@@ -0,0 +1,117 @@
+import asyncio
+import time
+from datetime import timedelta
+
+from app.controller.search_params_model import SearchParams
+from app.elastic.es_search_runner import ElasticSearchRunner
+from app.service.build_api_response import get_response_time_to_live
+from app.service.search_type import SearchType
+from app.utils import cache
+from app.utils.cache import CacheEntry, cache_strategy, serialise_cache_entry
+
+SEARCH_RESULTS = {
+    "total_results": 1,
+    "response": [{"unite_legale": {"siren": "356000000"}}],
+    "execution_time": 10,
+    "cursor": None,
+}
+
+
+class EmptyRedisClient:
+    async def get_with_time_to_live(self, key):
+        return None, None
+
+    async def set(self, key, value, time_to_live):
+        pass
+
+
+class CachedRedisClient(EmptyRedisClient):
+    def __init__(self, cache_entry):
+        self.serialised_entry, _ = serialise_cache_entry(cache_entry)
+
+    async def get_with_time_to_live(self, key):
+        return self.serialised_entry, None
+
+
+class FailingRedisClient(EmptyRedisClient):
+    async def get_with_time_to_live(self, key):
+        raise ConnectionError("Redis is unavailable")
+
+
+def run_concurrent_misses(monkeypatch, redis_client, get_value, calls=5):
+    monkeypatch.setattr(cache, "RedisClient", lambda: redis_client)
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                cache_strategy(
+                    "search:test-cache-strategy", get_value, lambda: timedelta(0)
+                )
+                for _ in range(calls)
+            ],
+            return_exceptions=True,
+        )
+
+    return asyncio.run(run())
+
+
+def test_search_errors_are_not_retried_by_coalesced_callers(monkeypatch):
+    executions = []
+
+    async def get_value():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("Elasticsearch is unavailable")
+
+    results = run_concurrent_misses(monkeypatch, EmptyRedisClient(), get_value)
+    assert len(executions) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_values_are_computed_when_the_cache_fails(monkeypatch):
+    async def get_value():
+        return {"total_results": 1}
+
+    results = run_concurrent_misses(monkeypatch, FailingRedisClient(), get_value)
+    assert [cache_entry.value for cache_entry in results] == [
+        {"total_results": 1}
+    ] * len(results)
+
+
+def run_cached_search(monkeypatch, fresh_until):
+    monkeypatch.setattr(
+        cache,
+        "RedisClient",
+        lambda: CachedRedisClient(CacheEntry(SEARCH_RESULTS, fresh_until)),
+    )
+    es_search_results = ElasticSearchRunner(
+        SearchParams(terms="test cache strategy"), SearchType.TEXT
+    )
+
+    async def execute_and_format_es_search():
+        return SEARCH_RESULTS
+
+    monkeypatch.setattr(
+        es_search_results,
+        "execute_and_format_es_search",
+        execute_and_format_es_search,
+    )
+    asyncio.run(es_search_results.execute_es_search_query())
+    return es_search_results
+
+
+def test_responses_of_stale_search_results_are_not_cached(monkeypatch):
+    es_search_results = run_cached_search(monkeypatch, time.time() - 1)
+    assert es_search_results.total_results == 1
+    assert get_response_time_to_live(es_search_results) == timedelta(0)
+
+
+def test_responses_are_cached_until_their_search_results_are_stale(monkeypatch):
+    remaining_freshness = 5
+    es_search_results = run_cached_search(
+        monkeypatch, time.time() + remaining_freshness
+    )
+    response_time_to_live = get_response_time_to_live(es_search_results)
+    assert (
+        timedelta(0) < response_time_to_live <= timedelta(seconds=remaining_freshness)
+    )
@@ -0,0 +1,56 @@
+import pytest
+
+from app.utils import circuit_breaker as circuit_breaker_module
+from app.utils.circuit_breaker import CircuitBreaker, CircuitState
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {"now": 0.0}
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", lambda: clock["now"])
+    return clock
+
+
+def open_circuit_breaker():
+    circuit_breaker = CircuitBreaker("test", failure_threshold=2, cool_down=30)
+    circuit_breaker.record_failure()
+    circuit_breaker.record_failure()
+    return circuit_breaker
+
+
+def test_opens_after_consecutive_failures(clock):
+    circuit_breaker = CircuitBreaker("test", failure_threshold=2, cool_down=30)
+    circuit_breaker.record_failure()
+    circuit_breaker.record_success()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitState.CLOSED
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitState.OPEN
+    assert not circuit_breaker.allow_call()
+    assert circuit_breaker.stats()["skipped_calls"] == 1
+
+
+def test_lets_a_single_probe_through_after_cool_down(clock):
+    circuit_breaker = open_circuit_breaker()
+    clock["now"] = 31
+    assert circuit_breaker.state == CircuitState.HALF_OPEN
+    assert circuit_breaker.allow_call()
+    assert not circuit_breaker.allow_call()
+
+
+def test_closes_when_probe_succeeds(clock):
+    circuit_breaker = open_circuit_breaker()
+    clock["now"] = 31
+    circuit_breaker.allow_call()
+    circuit_breaker.record_success()
+    assert circuit_breaker.state == CircuitState.CLOSED
+    assert circuit_breaker.allow_call()
+
+
+def test_opens_again_when_probe_fails(clock):
+    circuit_breaker = open_circuit_breaker()
+    clock["now"] = 31
+    circuit_breaker.allow_call()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitState.OPEN
+    assert circuit_breaker.stats()["times_opened"] == 1
@@ -0,0 +1,46 @@
+import asyncio
+
+from app.service import convention_collective
+from app.service.convention_collective import (
+    IDCC_SOURCE_FIELDS,
+    get_idcc_siret_mappings,
+)
+from app.utils.cache import CacheEntry
+
+
+def build_structure(siren, sirets_par_idcc):
+    return {"unite_legale": {"siren": siren, "sirets_par_idcc": sirets_par_idcc}}
+
+
+def test_idcc_mappings_are_fetched_once_then_cached(monkeypatch):
+    cache = {}
+    searches = []
+
+    async def get_cache_entry(cache_client, key):
+        return cache.get(key)
+
+    async def cache_value(cache_client, key, value, time_to_live):
+        cache[key] = CacheEntry(value)
+
+    async def search_index_by_sirens(sirens, source_fields):
+        searches.append((sirens, source_fields))
+        return {
+            "356000000": build_structure(
+                "356000000", "{'1486': ['35600000000048', '35600000000049']}"
+            )
+        }
+
+    monkeypatch.setattr(convention_collective, "get_cache_entry", get_cache_entry)
+    monkeypatch.setattr(convention_collective, "cache_value", cache_value)
+    monkeypatch.setattr(
+        convention_collective, "search_index_by_sirens", search_index_by_sirens
+    )
+    sirens = ["356000000", "356000001", "356000000"]
+    expected_mappings = {
+        "356000000": {"1486": ["35600000000048", "35600000000049"]},
+        "356000001": {},
+    }
+
+    assert asyncio.run(get_idcc_siret_mappings(sirens)) == expected_mappings
+    assert asyncio.run(get_idcc_siret_mappings(sirens)) == expected_mappings
+    assert searches == [(["356000000", "356000001"], IDCC_SOURCE_FIELDS)]
@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from app.controller.search_params_model import SearchParams
+from app.elastic import es_search_runner
+from app.elastic.es_search_runner import CURSOR_FETCH_FACTOR, ElasticSearchRunner
+from app.elastic.helpers.cursor import (
+    FIRST_PAGE_CURSOR,
+    CursorPage,
+    decode_cursor,
+    encode_cursor,
+)
+from app.exceptions.exceptions import InvalidParamError
+from app.service.search_type import SearchType
+
+
+def build_structure(identifiant, nombre_etablissements_ouverts=1):
+    return {
+        "identifiant": identifiant,
+        "meta": {"sort": [nombre_etablissements_ouverts, identifiant]},
+    }
+
+
+def test_cursor_round_trip():
+    sort_values = [12.5, 3, "356000000"]
+    assert decode_cursor(encode_cursor(sort_values)) == sort_values
+    assert decode_cursor(FIRST_PAGE_CURSOR) is None
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor([]), "e30="])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidParamError):
+        decode_cursor(cursor)
+
+
+def test_cursor_can_not_be_used_with_page():
+    with pytest.raises(InvalidParamError):
+        SearchParams(terms="la poste", cursor=FIRST_PAGE_CURSOR, page="2")
+
+
+def test_documents_of_a_structure_are_deduplicated():
+    per_page = 2
+    # The last structure of the previous page is 356000000, whose documents
+    # may span both pages
+    cursor = encode_cursor([1, "356000000"])
+    structures = [
+        build_structure("356000000"),
+        build_structure("356000001"),
+        build_structure("356000001"),
+        build_structure("356000002"),
+        build_structure("356000003"),
+    ]
+    page = CursorPage(cursor, per_page)
+    page.add_hits(structures, len(structures))
+    assert page.is_complete
+    assert [structure["identifiant"] for structure in page.structures] == [
+        "356000001",
+        "356000002",
+    ]
+    assert decode_cursor(page.next_cursor) == [1, "356000002"]
+
+
+def test_last_page_has_no_next_cursor():
+    per_page = 2
+    size = 4
+    structures = [build_structure("356000000"), build_structure("356000001")]
+    page = CursorPage(FIRST_PAGE_CURSOR, per_page)
+    page.add_hits(structures, size)
+    assert page.is_complete
+    assert len(page.structures) == per_page
+    assert page.next_cursor is None
+
+
+def build_hit(identifiant):
+    return {
+        "_source": {"identifiant": identifiant},
+        "sort": [1, identifiant],
+    }
+
+
+def run_cursor_search(monkeypatch, hits, per_page, cursor=FIRST_PAGE_CURSOR):
+    """Run a cursor search over `hits`, sorted by `identifiant`. As in
+    Elasticsearch, the hits searched after are those whose sort values are
+    strictly greater."""
+    searches_after = []
+
+    def get_hits_after(search_after, size):
+        if search_after is not None:
+            hits_after = [hit for hit in hits if hit["sort"] > search_after]
+        else:
+            hits_after = hits
+        return hits_after[:size]
+
+    async def execute_multi_search(searches, raw):
+        search = searches[0].to_dict()
+        hits_page = {
+            "hits": get_hits_after(search.get("search_after"), search["size"]),
+            "total": {"value": 1},
+        }
+        count = {"took": 1, "aggregations": {"by_cluster": {"value": 1}}}
+        return {"took": 1, "hits": hits_page}, count
+
+    async def execute_search(search, raw):
+        search = search.to_dict()
+        searches_after.append(search["search_after"])
+        hits_page = {"hits": get_hits_after(search["search_after"], search["size"])}
+        return {"took": 1, "hits": hits_page}
+
+    monkeypatch.setattr(es_search_runner, "execute_multi_search", execute_multi_search)
+    monkeypatch.setattr(es_search_runner, "execute_search", execute_search)
+    runner = ElasticSearchRunner(
+        SearchParams(terms="la poste", cursor=cursor, per_page=per_page),
+        SearchType.TEXT,
+    )
+    runner.build_es_search_query()
+    asyncio.run(runner.execute_and_format_es_search())
+    return runner, searches_after
+
+
+def test_page_is_completed_past_a_structure_split_in_many_documents(monkeypatch):
+    per_page = 2
+    # More documents than fetched by the first search of the page
+    documents = 5 * CURSOR_FETCH_FACTOR * per_page
+    hits = [build_hit("356000000") for _ in range(documents)] + [
+        build_hit("356000001"),
+        build_hit("356000002"),
+    ]
+
+    runner, searches_after = run_cursor_search(monkeypatch, hits, per_page)
+
+    assert [structure["identifiant"] for structure in runner.es_search_results] == [
+        "356000000",
+        "356000001",
+    ]
+    assert decode_cursor(runner.cursor) == [1, "356000001"]
+    assert searches_after == [[1, "356000000"]]
+
+
+def test_page_holding_the_last_structure_has_no_next_cursor(monkeypatch):
+    per_page = 2
+    documents = 3 * CURSOR_FETCH_FACTOR * per_page
+    hits = [build_hit("356000000") for _ in range(documents)]
+
+    runner, _ = run_cursor_search(monkeypatch, hits, per_page)
+
+    assert [structure["identifiant"] for structure in runner.es_search_results] == [
+        "356000000"
+    ]
+    assert runner.cursor is None
@@ -0,0 +1,136 @@
+import orjson
+import pytest
+
+from app.controller.search_params_model import SearchParams
+from app.service import format_search_results
+from app.service.formatters.convention_collective import (
+    extract_idcc_siret_mapping_from_ul,
+)
+from app.service.formatters.display_fields import DISPLAY_FIELDS_VERSION
+from app.service.formatters.enseignes import format_enseignes
+from app.service.formatters.nom_complet import format_nom_complet, get_nom_commercial
+from app.tests.unit_tests.test_format_search_results import (
+    GOLDEN_DIR,
+    SEARCH_PARAMS,
+    dumps,
+    load_sources,
+)
+from app.utils.helpers import string_list_to_string
+
+
+def add_etablissement_display_fields(etablissement, version, liste_enseignes):
+    etablissement["display"] = {
+        "version": version,
+        "liste_enseignes": liste_enseignes(etablissement),
+    }
+
+
+def add_display_fields(results, version, nom_complet, type_siae, liste_enseignes):
+    for result in results:
+        unite_legale = result["unite_legale"]
+        unite_legale["display"] = {
+            "version": version,
+            "nom_complet": nom_complet(unite_legale),
+            "type_siae": type_siae(unite_legale),
+        }
+        etablissements = result["matching_etablissements"] + (
+            unite_legale.get("etablissements") or []
+        )
+        if unite_legale.get("siege"):
+            etablissements.append(unite_legale["siege"])
+        for etablissement in etablissements:
+            add_etablissement_display_fields(etablissement, version, liste_enseignes)
+    return results
+
+
+def compute_nom_complet(unite_legale):
+    return format_nom_complet(
+        unite_legale.get("nom_complet"),
+        unite_legale.get("sigle"),
+        get_nom_commercial(unite_legale.get("siege")),
+        unite_legale.get("denomination_usuelle_1_unite_legale"),
+        unite_legale.get("denomination_usuelle_2_unite_legale"),
+        unite_legale.get("denomination_usuelle_3_unite_legale"),
+    )
+
+
+def compute_liste_enseignes(etablissement):
+    return format_enseignes(
+        [etablissement.get(f"enseigne_{index}") for index in range(1, 4)]
+    )
+
+
+@pytest.fixture(autouse=True)
+def prod_env(monkeypatch):
+    monkeypatch.setattr(format_search_results, "is_dev_env", lambda: False)
+
+
+@pytest.mark.parametrize("case", SEARCH_PARAMS)
+def test_display_fields_give_the_same_results(case):
+    golden = orjson.loads((GOLDEN_DIR / "search_results.json").read_bytes())
+    results = add_display_fields(
+        load_sources(),
+        DISPLAY_FIELDS_VERSION,
+        compute_nom_complet,
+        lambda unite_legale: string_list_to_string(unite_legale.get("type_siae")),
+        compute_liste_enseignes,
+    )
+
+    formatted_results = format_search_results.format_search_results(
+        results, SearchParams(**SEARCH_PARAMS[case])
+    )
+
+    assert dumps(formatted_results) == dumps(golden[case])
+
+
+def test_display_fields_are_read_instead_of_formatting():
+    results = add_display_fields(
+        load_sources(),
+        DISPLAY_FIELDS_VERSION,
+        lambda unite_legale: "NOM PRECALCULE",
+        lambda unite_legale: "EI",
+        lambda etablissement: ["ENSEIGNE PRECALCULEE"],
+    )
+
+    formatted_result = format_search_results.format_search_results(
+        results, SearchParams(terms="la poste")
+    )[0]
+
+    assert formatted_result["nom_complet"] == "NOM PRECALCULE"
+    assert formatted_result["complements"]["type_siae"] == "EI"
+    assert formatted_result["siege"]["liste_enseignes"] == ["ENSEIGNE PRECALCULEE"]
+    assert formatted_result["matching_etablissements"][0]["liste_enseignes"] == [
+        "ENSEIGNE PRECALCULEE"
+    ]
+
+
+def test_display_fields_of_another_version_are_ignored():
+    golden = orjson.loads((GOLDEN_DIR / "search_results.json").read_bytes())
+    results = add_display_fields(
+        load_sources(),
+        DISPLAY_FIELDS_VERSION + 1,
+        lambda unite_legale: "NOM PRECALCULE",
+        lambda unite_legale: "EI",
+        lambda etablissement: ["ENSEIGNE PRECALCULEE"],
+    )
+
+    formatted_results = format_search_results.format_search_results(
+        results, SearchParams(terms="la poste")
+    )
+
+    assert dumps(formatted_results) == dumps(golden["default"])
+
+
+def test_idcc_siret_mapping_is_read_from_display_fields():
+    ul_result = {
+        "unite_legale": {
+            "sirets_par_idcc": "{'1486': ['35600000000012']}",
+            "display": {
+                "version": DISPLAY_FIELDS_VERSION,
+                "sirets_par_idcc": {"1486": ["35600000000012"]},
+            },
+        }
+    }
+    assert extract_idcc_siret_mapping_from_ul(ul_result) == {"1486": ["35600000000012"]}
+    del ul_result["unite_legale"]["display"]
+    assert extract_idcc_siret_mapping_from_ul(ul_result) == {"1486": ["35600000000012"]}
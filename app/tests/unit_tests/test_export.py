@@ -0,0 +1,44 @@
+import asyncio
+
+import orjson
+from elasticsearch_dsl import Search
+
+from app.controller.search_params_model import SearchParams
+from app.service import build_export_response
+from app.service.build_export_response import stream_unites_legales
+
+
+def build_page(*identifiants):
+    hits = [
+        {
+            "_id": f"{identifiant}-{index}",
+            "_source": {
+                "identifiant": identifiant,
+                "unite_legale": {"siren": identifiant},
+            },
+        }
+        for index, identifiant in enumerate(identifiants)
+    ]
+    return {"hits": {"total": {"value": 0}, "hits": hits}}
+
+
+def test_documents_of_a_structure_are_exported_once(monkeypatch):
+    async def iterate_search_pages(search, sort, page_size, raw):
+        # The documents of 356000001 span two pages
+        yield build_page("356000000", "356000001")
+        yield build_page("356000001", "356000002")
+
+    monkeypatch.setattr(
+        build_export_response, "iterate_search_pages", iterate_search_pages
+    )
+    search_params = SearchParams(departement="75", minimal="true")
+
+    async def export():
+        return [chunk async for chunk in stream_unites_legales(Search(), search_params)]
+
+    lines = b"".join(asyncio.run(export())).splitlines()
+    assert [orjson.loads(line)["siren"] for line in lines] == [
+        "356000000",
+        "356000001",
+        "356000002",
+    ]
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import orjson
+import pytest
+
+from app.controller.search_params_model import SearchParams
+from app.service import format_search_results
+from app.service.format_search_results import format_single_unite_legale
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+
+# Search parameters of the cases of `golden/search_results.json`
+SEARCH_PARAMS = {
+    "default": {"terms": "la poste"},
+    "minimal": {"terms": "la poste", "minimal": "true"},
+    "minimal_include": {
+        "terms": "la poste",
+        "minimal": "true",
+        "include": (
+            "siege,dirigeants,finances,complements,matching_etablissements,score"
+        ),
+    },
+    "include_admin": {
+        "terms": "la poste",
+        "include_admin": "etablissements,slug,immatriculation",
+    },
+}
+
+
+def load_sources():
+    return orjson.loads((GOLDEN_DIR / "search_results_sources.json").read_bytes())
+
+
+def dumps(value) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+@pytest.fixture
+def prod_env(monkeypatch):
+    monkeypatch.setattr(format_search_results, "is_dev_env", lambda: False)
+
+
+@pytest.mark.parametrize("case", SEARCH_PARAMS)
+def test_formatter_matches_golden_file(case, prod_env):
+    golden = orjson.loads((GOLDEN_DIR / "search_results.json").read_bytes())
+    search_params = SearchParams(**SEARCH_PARAMS[case])
+
+    formatted_results = format_search_results.format_search_results(
+        load_sources(), search_params
+    )
+
+    assert dumps(formatted_results) == dumps(golden[case])
+
+
+@pytest.mark.parametrize("case", SEARCH_PARAMS)
+def test_diffusible_unites_legales_are_formatted_alike_one_by_one(case, prod_env):
+    search_params = SearchParams(**SEARCH_PARAMS[case])
+    formatted_results = format_search_results.format_search_results(
+        load_sources(), search_params
+    )
+    for result, formatted_result in zip(load_sources(), formatted_results):
+        if result["unite_legale"].get("statut_diffusion_unite_legale") != "P":
+            assert dumps(format_single_unite_legale(result, search_params)) == dumps(
+                formatted_result
+            )
+
+
+def test_meta_is_included_last_in_dev_env(monkeypatch):
+    monkeypatch.setattr(format_search_results, "is_dev_env", lambda: True)
+    result = load_sources()[0]
+
+    formatted_unite_legale = format_single_unite_legale(
+        result, SearchParams(**SEARCH_PARAMS["default"])
+    )
+
+    assert list(formatted_unite_legale)[-1] == "meta"
+    assert formatted_unite_legale["meta"] == orjson.loads(
+        orjson.dumps(result["meta"], default=str)
+    )
@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.utils.http_client import JsonResource
+
+URL = "https://metadata.example.com/cc_kali.json"
+LAST_MODIFIED = "Wed, 01 May 2024 00:00:00 GMT"
+
+
+def fetch(resource, handler):
+    async def fetch_with_mock_transport():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await resource.fetch(client)
+
+    return asyncio.run(fetch_with_mock_transport())
+
+
+def test_unchanged_file_is_revalidated():
+    resource = JsonResource(URL)
+    requests_headers = []
+
+    def handler(request):
+        requests_headers.append(request.headers)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            json={"1486": "Bureaux d'études techniques"},
+            headers={"ETag": '"v1"', "Last-Modified": LAST_MODIFIED},
+        )
+
+    value = fetch(resource, handler)
+    assert fetch(resource, handler) is value
+    assert "If-None-Match" not in requests_headers[0]
+    assert requests_headers[1]["If-None-Match"] == '"v1"'
+    assert requests_headers[1]["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_changed_file_is_fetched_again():
+    resource = JsonResource(URL)
+    versions = iter(["v1", "v2"])
+
+    def handler(request):
+        version = next(versions)
+        return httpx.Response(
+            200, json={"version": version}, headers={"ETag": f'"{version}"'}
+        )
+
+    assert fetch(resource, handler) == {"version": "v1"}
+    assert fetch(resource, handler) == {"version": "v2"}
+    assert resource.etag == '"v2"'
+
+
+@pytest.mark.parametrize(
+    "response",
+    [httpx.Response(503), httpx.Response(200, content=b"<html>")],
+)
+def test_fetch_errors_are_raised(response):
+    with pytest.raises(RuntimeError):
+        fetch(JsonResource(URL), lambda request: response)
@@ -0,0 +1,81 @@
+import asyncio
+
+import orjson
+import pytest
+from elasticsearch_dsl import Search
+
+from app.exceptions.exceptions import InvalidParamError
+from app.service import convention_collective
+from app.service.convention_collective import (
+    build_json_array,
+    stream_idcc_sirets,
+    stream_idcc_sirets_response,
+)
+
+
+def build_page(*structures):
+    hits = [
+        {
+            "_source": {
+                "identifiant": siren,
+                "unite_legale": {"siren": siren, "sirets_par_idcc": sirets_par_idcc},
+            }
+        }
+        for siren, sirets_par_idcc in structures
+    ]
+    return {"hits": {"hits": hits}}
+
+
+def list_sirets(monkeypatch, *pages):
+    async def iterate_search_pages(search, sort, page_size, raw):
+        for page in pages:
+            yield page
+
+    monkeypatch.setattr(
+        convention_collective, "iterate_search_pages", iterate_search_pages
+    )
+
+    async def list_idcc_sirets():
+        chunks = stream_idcc_sirets(Search(), "1486")
+        first_chunk = await anext(chunks, None)
+        return b"".join(
+            [chunk async for chunk in build_json_array(first_chunk, chunks)]
+        )
+
+    return orjson.loads(asyncio.run(list_idcc_sirets()))
+
+
+def test_sirets_under_the_idcc_are_listed_once(monkeypatch):
+    large_structure = ("356000001", "{'1486': ['35600000100012', '35600000100020']}")
+    sirets = list_sirets(
+        monkeypatch,
+        build_page(
+            ("356000000", "{'1486': ['35600000000048'], '7002': ['35600000000049']}"),
+            large_structure,
+        ),
+        # The documents of 356000001 span two pages
+        build_page(large_structure, ("356000002", "{'1486': ['35600000200013']}")),
+    )
+    assert sirets == [
+        "35600000000048",
+        "35600000100012",
+        "35600000100020",
+        "35600000200013",
+    ]
+
+
+def test_no_sirets_under_the_idcc_is_an_empty_list(monkeypatch):
+    assert list_sirets(monkeypatch, build_page(("356000000", None))) == []
+
+
+@pytest.mark.parametrize("idcc", ["148", "14860", "abcd", "14 6", "148a"])
+def test_idcc_must_have_four_digits(idcc, monkeypatch):
+    async def iterate_search_pages(*args, **kwargs):
+        raise AssertionError("Elasticsearch must not be searched")
+        yield
+
+    monkeypatch.setattr(
+        convention_collective, "iterate_search_pages", iterate_search_pages
+    )
+    with pytest.raises(InvalidParamError):
+        asyncio.run(stream_idcc_sirets_response(idcc))
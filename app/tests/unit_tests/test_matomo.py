@@ -0,0 +1,97 @@
+import asyncio
+
+import httpx
+import orjson
+
+from app.utils.matomo import MatomoTracker
+
+TRACKING_URL = "https://matomo.example.com/matomo.php?"
+
+
+def build_tracker(handler, max_queue_size=10, bulk_max_size=10, flush_interval=0):
+    return MatomoTracker(
+        tracking_url=TRACKING_URL,
+        max_queue_size=max_queue_size,
+        bulk_max_size=bulk_max_size,
+        flush_interval=flush_interval,
+        timeout=1,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+async def wait_until_queue_is_empty(tracker):
+    while tracker.events:
+        await asyncio.sleep(0.01)
+    # Let the bulk request being sent complete
+    await asyncio.sleep(0.01)
+
+
+def test_events_are_sent_in_bulk_requests():
+    bulk_requests = []
+
+    def handler(request):
+        bulk_requests.append(request)
+        return httpx.Response(200)
+
+    async def track_events():
+        tracker = build_tracker(handler, bulk_max_size=2)
+        for index in range(3):
+            tracker.track({"idsite": "1", "rec": 1, "url": f"/search?q={index}"})
+        await wait_until_queue_is_empty(tracker)
+        await tracker.close()
+        return tracker
+
+    tracker = asyncio.run(track_events())
+
+    assert [str(request.url) for request in bulk_requests] == [
+        "https://matomo.example.com/matomo.php"
+    ] * 2
+    assert orjson.loads(bulk_requests[0].content) == {
+        "requests": [
+            "?idsite=1&rec=1&url=%2Fsearch%3Fq%3D0",
+            "?idsite=1&rec=1&url=%2Fsearch%3Fq%3D1",
+        ]
+    }
+    assert orjson.loads(bulk_requests[1].content) == {
+        "requests": ["?idsite=1&rec=1&url=%2Fsearch%3Fq%3D2"]
+    }
+    assert tracker.stats() == {
+        "queued_events": 0,
+        "sent_events": 3,
+        "dropped_events": 0,
+        "failed_events": 0,
+    }
+
+
+def test_oldest_events_are_dropped_when_the_queue_is_full():
+    async def track_events():
+        tracker = build_tracker(
+            lambda request: httpx.Response(200), max_queue_size=2, flush_interval=60
+        )
+        for index in range(3):
+            tracker.track({"url": str(index)})
+        events = list(tracker.events)
+        tracker.task.cancel()
+        return tracker, events
+
+    tracker, events = asyncio.run(track_events())
+
+    assert events == ["?url=1", "?url=2"]
+    assert tracker.stats()["dropped_events"] == 1
+
+
+def test_events_of_failed_requests_are_counted():
+    urls = ["/search?q=0", "/search?q=1"]
+
+    async def track_events():
+        tracker = build_tracker(lambda request: httpx.Response(500))
+        for url in urls:
+            tracker.track({"url": url})
+        await wait_until_queue_is_empty(tracker)
+        await tracker.close()
+        return tracker
+
+    tracker = asyncio.run(track_events())
+
+    assert tracker.stats()["sent_events"] == 0
+    assert tracker.stats()["failed_events"] == len(urls)
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from app.utils import memory_cache as memory_cache_module
+from app.utils.memory_cache import MemoryCache
+
+ONE_HOUR = timedelta(hours=1)
+
+
+def build_cache(max_entries=10, max_size=1000):
+    return MemoryCache(max_entries, max_size, max_time_to_live=ONE_HOUR)
+
+
+def test_get_returns_cached_value_and_counts_hits_and_misses():
+    cache = build_cache()
+    assert cache.get("key") is None
+    cache.set("key", {"siren": "356000000"}, ONE_HOUR, size=10)
+    assert cache.get("key") == {"siren": "356000000"}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted_on_max_entries():
+    cache = build_cache(max_entries=2)
+    cache.set("a", 1, ONE_HOUR, size=1)
+    cache.set("b", 2, ONE_HOUR, size=1)
+    cache.get("a")
+    cache.set("c", "value", ONE_HOUR, size=1)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == "value"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_are_evicted_on_max_size():
+    entry_size = 60
+    cache = build_cache(max_size=100)
+    cache.set("a", 1, ONE_HOUR, size=entry_size)
+    cache.set("b", 2, ONE_HOUR, size=entry_size)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == entry_size
+    # Values larger than the cache are never stored
+    cache.set("c", 3, ONE_HOUR, size=101)
+    assert cache.get("c") is None
+
+
+def test_entries_expire_after_time_to_live(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(memory_cache_module.time, "monotonic", lambda: now)
+    cache = build_cache()
+    cache.set("key", "value", timedelta(seconds=30), size=5)
+    now += 29
+    assert cache.get("key") == "value"
+    now += 2
+    assert cache.get("key") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_time_to_live_is_capped():
+    cache = MemoryCache(10, 1000, max_time_to_live=timedelta(0))
+    cache.set("key", "value", ONE_HOUR, size=5)
+    assert cache.get("key") is None
@@ -0,0 +1,168 @@
+import asyncio
+import gzip
+
+import orjson
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.exceptions.exceptions import ServiceUnavailableError
+from app.main import app
+from app.service.convention_collective import get_metadata_cc_document
+from app.utils.metadata_document import UNAVAILABLE_MESSAGE, MetadataDocument
+
+
+class FakeResource:
+    """Remote file returning the given values, or raising when given `None`."""
+
+    def __init__(self, *values):
+        self.values = iter(values)
+        self.fetches = 0
+
+    async def fetch(self):
+        self.fetches += 1
+        await asyncio.sleep(0)
+        value = next(self.values)
+        if value is None:
+            raise RuntimeError("Error fetching JSON")
+        return value
+
+
+def build_document(*values, retry_interval=30):
+    document = MetadataDocument(
+        "cc_kali_json", "https://example.com", 3600, retry_interval
+    )
+    document.resource = FakeResource(*values)
+    return document
+
+
+def build_request(**headers):
+    return Request(
+        {
+            "type": "http",
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+def get_response(document, request):
+    return asyncio.run(document.get_response(request))
+
+
+def test_document_is_served_pre_encoded():
+    value = {"1486": "Bureaux d'études techniques"}
+    document = build_document(value)
+
+    response = get_response(document, build_request())
+    gzipped_response = get_response(document, build_request(accept_encoding="gzip"))
+
+    assert response.body == orjson.dumps(value)
+    assert gzip.decompress(gzipped_response.body) == response.body
+    assert gzipped_response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"] != gzipped_response.headers["ETag"]
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, is_gzipped",
+    [
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.8", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("*;q=0.5, gzip;q=0", False),
+        ("identity", False),
+    ],
+)
+def test_gzip_is_sent_when_accepted(accept_encoding, is_gzipped):
+    document = build_document({"1486": "Bureaux d'études techniques"})
+
+    response = get_response(document, build_request(accept_encoding=accept_encoding))
+
+    assert ("Content-Encoding" in response.headers) is is_gzipped
+
+
+@pytest.mark.parametrize("accept_encoding", ["identity", "gzip"])
+def test_unchanged_document_is_not_modified(accept_encoding):
+    document = build_document({"1486": "Bureaux d'études techniques"})
+    request = build_request(accept_encoding=accept_encoding)
+    etag = get_response(document, request).headers["ETag"]
+
+    response = get_response(
+        document, build_request(accept_encoding=accept_encoding, if_none_match=etag)
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.body == b""
+
+
+def test_etag_of_another_coding_does_not_match():
+    document = build_document({"1486": "Bureaux d'études techniques"})
+    etag = get_response(document, build_request()).headers["ETag"]
+
+    response = get_response(
+        document, build_request(accept_encoding="gzip", if_none_match=etag)
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_last_good_version_is_served_when_refresh_fails():
+    value = {"1486": "Bureaux d'études techniques"}
+    document = build_document(value, None, value)
+    asyncio.run(document.refresh())
+    body, etag = document.body, document.etag
+
+    asyncio.run(document.refresh())
+    assert get_response(document, build_request()).body == body
+
+    # The resource returns the same value when the file did not change
+    asyncio.run(document.refresh())
+    assert document.body is body
+    assert document.etag == etag
+
+
+def test_unavailable_document_is_an_error():
+    with pytest.raises(ServiceUnavailableError):
+        get_response(build_document(None), build_request())
+
+
+def test_unavailable_document_is_not_fetched_again_until_retry_interval():
+    document = build_document(None, None)
+
+    async def get_responses():
+        return await asyncio.gather(
+            *[document.get_response(build_request()) for _ in range(5)],
+            return_exceptions=True,
+        )
+
+    responses = asyncio.run(get_responses())
+    assert all(isinstance(response, ServiceUnavailableError) for response in responses)
+    assert document.resource.fetches == 1
+
+    with pytest.raises(ServiceUnavailableError):
+        get_response(document, build_request())
+    assert document.resource.fetches == 1
+
+
+def test_unavailable_document_is_fetched_again_after_retry_interval():
+    value = {"1486": "Bureaux d'études techniques"}
+    document = build_document(None, value, retry_interval=0)
+
+    with pytest.raises(ServiceUnavailableError):
+        get_response(document, build_request())
+
+    assert get_response(document, build_request()).body == orjson.dumps(value)
+
+
+def test_unavailable_document_is_a_service_unavailable_response(monkeypatch):
+    monkeypatch.setattr(get_metadata_cc_document(), "resource", FakeResource(None))
+    monkeypatch.setattr(get_metadata_cc_document(), "failed_at", None)
+
+    response = TestClient(app).get("/idcc/metadata")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json() == {"erreur": UNAVAILABLE_MESSAGE}
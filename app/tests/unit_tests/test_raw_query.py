@@ -0,0 +1,22 @@
+from elasticsearch_dsl import Q, Search
+
+from app.elastic.helpers.raw_query import RawQuery, build_raw_bool_query
+from app.elastic.queries.text import build_text_query
+
+
+def test_raw_query_is_sent_as_given():
+    query = {"match": {"nom_complet": {"query": "la poste", "boost": 50}}}
+    search = Search().filter("term", departement="75").query(RawQuery(query))
+    assert search.to_dict()["query"]["bool"]["must"] == [query]
+    assert search.to_dict()["query"]["bool"]["must"][0] is query
+
+
+def test_raw_bool_query_is_combined_as_the_parsed_query():
+    text_query = build_text_query(terms="la poste", matching_size=10)
+    search = Search().filter("term", departement="75")
+    raw_search = search.query(build_raw_bool_query(text_query))
+    parsed_search = search.query(Q(text_query))
+    raw_search_query = raw_search.to_dict()["query"]
+    # Parsing normalises function_score clauses, which are otherwise the same
+    assert Q(raw_search_query).to_dict() == parsed_search.to_dict()["query"]
+    assert raw_search_query["bool"]["should"] == text_query["bool"]["should"]
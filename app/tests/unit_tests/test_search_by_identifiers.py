@@ -0,0 +1,54 @@
+from app.elastic.helpers.helpers import extract_ul_and_etab_from_hit
+from app.elastic.queries.search_by_identifiers import (
+    build_sirets_lookup_search,
+    extract_structures_by_siret,
+)
+
+
+def build_hit(siren, sirets):
+    return {
+        "_id": f"{siren}-0",
+        "_source": {"identifiant": siren, "unite_legale": {"siren": siren}},
+        "inner_hits": {
+            "unite_legale.etablissements": {
+                "hits": {"hits": [{"_source": {"siret": siret}} for siret in sirets]}
+            }
+        },
+    }
+
+
+def test_sirets_lookup_filters_by_siren_first():
+    query = build_sirets_lookup_search(["35600000000048", "35600000000049"]).to_dict()
+    siren_filter, siret_filter = query["query"]["bool"]["filter"]
+    assert siren_filter == {"terms": {"unite_legale.siren": ["356000000"]}}
+    assert "nested" in siret_filter
+    assert "collapse" not in query
+
+
+def test_structures_are_dispatched_by_siret():
+    es_response = {
+        "hits": {
+            "total": {"value": 1},
+            "hits": [build_hit("356000000", ["35600000000048", "35600000000049"])],
+        }
+    }
+    structures = extract_structures_by_siret(es_response)
+    assert structures.keys() == {"35600000000048", "35600000000049"}
+    assert structures["35600000000049"]["matching_etablissements"] == [
+        {"siret": "35600000000049"}
+    ]
+
+
+def test_hit_meta_holds_its_fields_but_source_and_inner_hits():
+    hit = {
+        **build_hit("356000000", ["35600000000048"]),
+        "_score": 1.5,
+        "sort": [1.5, "356000000"],
+    }
+    structure = extract_ul_and_etab_from_hit(hit)
+    assert structure["meta"] == {
+        "id": "356000000-0",
+        "score": 1.5,
+        "sort": [1.5, "356000000"],
+    }
+    assert structure["matching_etablissements"] == [{"siret": "35600000000048"}]
@@ -0,0 +1,59 @@
+import asyncio
+
+from app.utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_a_single_execution():
+    executions = []
+
+    async def get_value():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return {"total_results": 1}
+
+    async def run():
+        single_flight = SingleFlight()
+        results = await asyncio.gather(
+            *[single_flight.do("key", get_value) for _ in range(10)]
+        )
+        # The key is released once the execution is done
+        assert single_flight.calls == {}
+        return results
+
+    results = asyncio.run(run())
+    assert len(executions) == 1
+    assert all(result == {"total_results": 1} for result in results)
+
+
+def test_different_keys_are_executed_separately():
+    executions = []
+
+    async def get_value():
+        executions.append(1)
+        await asyncio.sleep(0)
+
+    async def run():
+        single_flight = SingleFlight()
+        await asyncio.gather(
+            single_flight.do("a", get_value), single_flight.do("b", get_value)
+        )
+
+    asyncio.run(run())
+    assert len(executions) == len(["a", "b"])
+
+
+def test_exception_is_raised_to_every_caller():
+    async def get_value():
+        await asyncio.sleep(0)
+        raise RuntimeError("Elasticsearch is unavailable")
+
+    async def run():
+        single_flight = SingleFlight()
+        return await asyncio.gather(
+            single_flight.do("key", get_value),
+            single_flight.do("key", get_value),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,68 @@
+import pytest
+
+from app.controller.search_params_model import SearchParams
+from app.elastic.helpers.source_fields import get_source_fields
+from app.service.format_search_results import format_single_unite_legale
+
+
+class RecordingUniteLegale(dict):
+    """Unité légale with only its required fields, recording the fields read
+    from it."""
+
+    def __init__(self):
+        super().__init__(siren="356000000")
+        self.read_fields = set()
+
+    def get(self, field, default=None):
+        self.read_fields.add(field)
+        if field.startswith("est_") or field.endswith("_renseignee"):
+            return False
+        return super().get(field, default)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"terms": "la poste"},
+        {"terms": "la poste", "minimal": "true"},
+        {"terms": "la poste", "minimal": "true", "include": "siege,score"},
+        {
+            "terms": "la poste",
+            "include_admin": "etablissements,slug,immatriculation",
+        },
+    ],
+)
+def test_source_fields_hold_the_fields_read_by_the_formatters(params):
+    search_params = SearchParams(**params)
+    unite_legale = RecordingUniteLegale()
+    format_single_unite_legale(
+        {
+            "unite_legale": unite_legale,
+            "matching_etablissements": [],
+            "meta": {"score": 1.0},
+        },
+        search_params,
+    )
+    source_fields = {
+        source_field.split(".")[1]
+        for source_field in get_source_fields(search_params)
+        if source_field.startswith("unite_legale.")
+    }
+    assert unite_legale.read_fields <= source_fields
+
+
+def test_etablissements_are_only_fetched_when_requested():
+    assert "unite_legale.etablissements" not in get_source_fields(
+        SearchParams(terms="la poste")
+    )
+    assert "unite_legale.etablissements" in get_source_fields(
+        SearchParams(terms="la poste", include_admin="etablissements")
+    )
+
+
+def test_minimal_response_does_not_fetch_secondary_fields():
+    source_fields = get_source_fields(SearchParams(terms="la poste", minimal="true"))
+    assert "unite_legale.siege.nom_commercial" in source_fields
+    assert "unite_legale.siege" not in source_fields
+    assert "unite_legale.dirigeants_pp" not in source_fields
+    assert "unite_legale.bilan_financier" not in source_fields
@@ -1,54 +1,257 @@
-import json
+import asyncio
 import logging
-from collections.abc import Callable
+import time
+from collections.abc import Awaitable, Callable
 from datetime import timedelta
+from typing import NamedTuple
 
+import orjson
+
+from app.config import settings
+from app.utils import cache_codec
 from app.utils.helpers import hash_string
+from app.utils.memory_cache import get_memory_cache
 from app.utils.redis import RedisClient
+from app.utils.single_flight import SingleFlight, run_with_redis_lock
+
+# Bump to invalidate cached search results when their content changes
+SEARCH_CACHE_KEY_VERSION = 1
+
+# Concurrent cache misses on the same key within a worker share one execution
+single_flight = SingleFlight()
+
+# Keep a reference to background refreshes so they are not garbage collected
+background_refreshes: set[asyncio.Task] = set()
+
+
+class CacheTimeToLive(NamedTuple):
+    """A value is served as is for `fresh`, then served for `stale` more while
+    it is refreshed in the background, and dropped after `fresh + stale`.
+
+    Values larger than `max_size` bytes once serialized are not cached.
+    """
+
+    fresh: timedelta
+    stale: timedelta = timedelta(0)
+    max_size: int | None = None
+
+    @property
+    def max_age(self) -> timedelta:
+        return self.fresh + self.stale
+
+
+class CacheEntry(NamedTuple):
+    value: object
+    # Timestamp after which the value is stale, None if it never is
+    fresh_until: float | None = None
+
+    def is_fresh(self) -> bool:
+        return self.fresh_until is None or time.time() < self.fresh_until
+
+
+def build_key(key: str):
+    return hash_string(key)
 
 
-def build_key(key):
-    if isinstance(key, str):
-        return hash_string(key)
-    serialised_key = json.dumps(key.to_dict())
-    return hash_string(serialised_key)
+def build_search_cache_key(search_type, search_params) -> str:
+    """Canonical key of a search, derived from its parameters rather than from
+    the Elasticsearch query, which is much more expensive to serialize.
 
+    Only the parameters which are set are kept. List values are sorted and
+    deduplicated, as the order of filter values does not change the results.
+    """
+    params = {}
+    for name, value in search_params:
+        if isinstance(value, list):
+            params[name] = sorted(set(value))
+        elif value is not None:
+            params[name] = value
+    serialised_params = orjson.dumps(params, default=str).decode("utf-8")
+    return f"search:v{SEARCH_CACHE_KEY_VERSION}:{search_type.name}:{serialised_params}"
 
-def set_cache_value(cache_client, key, value, time_to_live):
+
+def serialise_cache_entry(cache_entry: CacheEntry) -> tuple[bytes, int]:
+    """Returns the encoded entry, and its size before compression."""
+    return cache_codec.encode(
+        {"fresh_until": cache_entry.fresh_until, "value": cache_entry.value}
+    )
+
+
+def deserialise_cache_entry(serialised_entry: bytes) -> tuple[CacheEntry, int]:
+    """Returns the decoded entry, and its size before compression."""
+    entry, size = cache_codec.decode(serialised_entry)
+    is_entry = isinstance(entry, dict) and entry.keys() == {"fresh_until", "value"}
+    if not is_entry:
+        # Value cached before staleness was tracked
+        return CacheEntry(entry), size
+    return CacheEntry(entry["value"], entry["fresh_until"]), size
+
+
+async def set_cache_value(
+    cache_client, key, value, time_to_live: CacheTimeToLive
+) -> CacheEntry | None:
+    """Returns the cached entry, None if the value is too large or on error."""
     try:
-        serialised_value = json.dumps(value, default=str)
-        cache_client.set(
+        cache_entry = CacheEntry(
+            value, time.time() + time_to_live.fresh.total_seconds()
+        )
+        serialised_entry, size = serialise_cache_entry(cache_entry)
+        if time_to_live.max_size is not None and size > time_to_live.max_size:
+            return None
+        await cache_client.set(
             key,
-            serialised_value,
-            time_to_live,
+            serialised_entry,
+            time_to_live.max_age,
         )
+        get_memory_cache().set(key, cache_entry, time_to_live.max_age, size)
+        return cache_entry
     except Exception as error:
         logging.info(f"Error while setting value for cache: {error}")
+        return None
+
 
+async def cache_value(
+    cache_client, key, value, time_to_live: timedelta | CacheTimeToLive
+) -> CacheEntry | None:
+    """Cache the value, unless its time to live is zero, and return its entry
+    if it was cached."""
+    if isinstance(time_to_live, timedelta):
+        time_to_live = CacheTimeToLive(time_to_live)
+    if time_to_live.fresh > timedelta(minutes=0):
+        return await set_cache_value(cache_client, key, value, time_to_live)
+    return None
 
-def cache_strategy(
+
+async def get_cache_entry(cache_client, key) -> CacheEntry | None:
+    """Look the key up in the worker memory cache, then in Redis.
+
+    Entries found in Redis are kept in memory for their remaining time to live.
+    A stale entry in memory is looked up again in Redis, where another worker
+    may already have refreshed it.
+    """
+    memory_cache = get_memory_cache()
+    cache_entry = memory_cache.get(key)
+    if cache_entry is not None and cache_entry.is_fresh():
+        return cache_entry
+    serialised_entry, time_to_live = await cache_client.get_with_time_to_live(key)
+    if not serialised_entry:
+        return cache_entry
+    try:
+        cache_entry, size = deserialise_cache_entry(serialised_entry)
+    except Exception as error:
+        logging.info(f"Error while decoding cached value: {error}")
+        return None
+    if time_to_live and time_to_live > 0:
+        memory_cache.set(
+            key,
+            cache_entry,
+            timedelta(milliseconds=time_to_live),
+            size,
+        )
+    return cache_entry
+
+
+async def set_raw_cache_value(cache_client, key, value, time_to_live: timedelta):
+    """Cache a value without its freshness, such a value is never served stale."""
+    try:
+        encoded_value, size = cache_codec.encode(value)
+        await cache_client.set(key, encoded_value, time_to_live)
+        get_memory_cache().set(key, value, time_to_live, size)
+    except Exception as error:
+        logging.info(f"Error while setting value for cache: {error}")
+
+
+async def get_raw_cache_value(cache_client, key):
+    memory_cache = get_memory_cache()
+    value = memory_cache.get(key)
+    if value is not None:
+        return value
+    encoded_value, time_to_live = await cache_client.get_with_time_to_live(key)
+    if not encoded_value:
+        return None
+    try:
+        value, size = cache_codec.decode(encoded_value)
+    except Exception as error:
+        logging.info(f"Error while decoding cached value: {error}")
+        return None
+    if time_to_live and time_to_live > 0:
+        memory_cache.set(key, value, timedelta(milliseconds=time_to_live), size)
+    return value
+
+
+async def get_cache_value(cache_client, key):
+    cache_entry = await get_cache_entry(cache_client, key)
+    return cache_entry.value if cache_entry else None
+
+
+def refresh_in_background(key, get_and_cache_value: Callable[[], Awaitable]):
+    """Refresh a stale entry without making the caller wait. Refreshes of the
+    same key are coalesced, like cache misses."""
+
+    def on_refresh_done(task):
+        background_refreshes.discard(task)
+        if not task.cancelled() and task.exception():
+            logging.info(f"Error while refreshing cache: {task.exception()}")
+
+    task = asyncio.ensure_future(single_flight.do(key, get_and_cache_value))
+    background_refreshes.add(task)
+    task.add_done_callback(on_refresh_done)
+
+
+async def cache_strategy(
     key,
-    get_value: Callable,
+    get_value: Callable[[], Awaitable],
     should_cache_for_how_long: Callable,
-):
+) -> CacheEntry:
+    """Return the cache entry of `key`, or compute its value with `get_value`.
+
+    `should_cache_for_how_long` is called after `get_value` and returns either a
+    `timedelta` or a `CacheTimeToLive` allowing stale values to be served. The
+    entry of a computed value is fresh for that time to live if it is cached, a
+    stale entry is returned as is while it is refreshed in the background.
+
+    Only errors of the cache itself make the caller compute the value on its
+    own. Errors of `get_value` are raised to every coalesced caller, which do
+    not all retry it.
+    """
+    redis_client_cache = RedisClient()
+    request_cache_key = build_key(key)
+    logging.info(f"Request cache key: {request_cache_key}")
+
+    async def get_and_cache_value():
+        value_to_cache = await get_value()
+        cache_entry = await cache_value(
+            redis_client_cache,
+            request_cache_key,
+            value_to_cache,
+            should_cache_for_how_long(),
+        )
+        # A value which is not cached is not fresh either
+        return cache_entry or CacheEntry(value_to_cache, time.time())
+
+    async def get_cached_entry():
+        cache_entry = await get_cache_entry(redis_client_cache, request_cache_key)
+        return cache_entry if cache_entry and cache_entry.value else None
+
+    async def get_and_cache_value_once():
+        if not settings.cache.lock_enabled:
+            return await get_and_cache_value()
+        return await run_with_redis_lock(
+            redis_client_cache,
+            request_cache_key,
+            get_and_cache_value,
+            get_cached_entry,
+        )
+
     try:
-        redis_client_cache = RedisClient()
-        # Serialize key object before hashing it
-        request_cache_key = build_key(key)
-        logging.info(f"Request cache key: {request_cache_key}")
-        cached_value = redis_client_cache.get(request_cache_key)
-        if cached_value:
-            return json.loads(cached_value)
-        value_to_cache = get_value()
-        time_to_live = should_cache_for_how_long()
-        if time_to_live > timedelta(minutes=0):
-            set_cache_value(
-                redis_client_cache,
-                request_cache_key,
-                value_to_cache,
-                time_to_live,
-            )
-        return value_to_cache
+        cache_entry = await get_cached_entry()
     except Exception as error:
         logging.info(f"Error while trying to cache: {error}")
-        return get_value()
+        # A value which is not cached is not fresh either
+        return CacheEntry(await get_value(), time.time())
+    if cache_entry:
+        if not cache_entry.is_fresh():
+            refresh_in_background(request_cache_key, get_and_cache_value_once)
+        return cache_entry
+
+    return await single_flight.do(request_cache_key, get_and_cache_value_once)
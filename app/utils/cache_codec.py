@@ -0,0 +1,72 @@
+"""Binary serialization of cached values.
+
+Encoded values start with a one byte header giving their format, so the format
+can change without invalidating what is already cached : every known format is
+decoded whatever the configured one. Values are serialized with orjson, except
+`bytes` which are stored as is, and compressed above
+`settings.cache.compression_threshold` bytes.
+"""
+
+import zlib
+from functools import partial
+
+import orjson
+
+from app.config import settings
+
+try:
+    import zstandard
+except ImportError:  # zstd compression is optional
+    zstandard = None
+
+FORMAT_JSON = 1
+FORMAT_JSON_ZLIB = 2
+FORMAT_JSON_ZSTD = 3
+FORMAT_BYTES = 4
+FORMAT_BYTES_ZLIB = 5
+FORMAT_BYTES_ZSTD = 6
+
+# Compressed formats are the uncompressed one plus an offset. Fast compression
+# levels are used : cached payloads are very redundant, higher levels cost
+# several times the CPU time for a few percent of size
+COMPRESSIONS = {
+    "zlib": (1, partial(zlib.compress, level=1), zlib.decompress),
+}
+if zstandard is not None:
+    COMPRESSIONS["zstd"] = (
+        2,
+        zstandard.ZstdCompressor(level=1).compress,
+        zstandard.ZstdDecompressor().decompress,
+    )
+DECOMPRESSIONS = {offset: decompress for offset, _, decompress in COMPRESSIONS.values()}
+
+
+def encode(value) -> tuple[bytes, int]:
+    """Returns the encoded value, and its size before compression."""
+    if isinstance(value, bytes):
+        header, serialised_value = FORMAT_BYTES, value
+    else:
+        header = FORMAT_JSON
+        serialised_value = orjson.dumps(
+            value, default=str, option=orjson.OPT_NON_STR_KEYS
+        )
+    size = len(serialised_value)
+    compression = COMPRESSIONS.get(settings.cache.compression)
+    if compression and size >= settings.cache.compression_threshold:
+        offset, compress, _ = compression
+        return bytes([header + offset]) + compress(serialised_value), size
+    return bytes([header]) + serialised_value, size
+
+
+def decode(encoded_value: bytes) -> tuple[object, int]:
+    """Returns the decoded value, and its size before compression."""
+    header, serialised_value = encoded_value[0], encoded_value[1:]
+    if not FORMAT_JSON <= header <= FORMAT_BYTES_ZSTD:
+        # Plain JSON, as cached before headers were added
+        return orjson.loads(encoded_value), len(encoded_value)
+    base_header = FORMAT_BYTES if header >= FORMAT_BYTES else FORMAT_JSON
+    if header != base_header:
+        serialised_value = DECOMPRESSIONS[header - base_header](serialised_value)
+    if base_header == FORMAT_BYTES:
+        return serialised_value, len(serialised_value)
+    return orjson.loads(serialised_value), len(serialised_value)
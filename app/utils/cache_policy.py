@@ -0,0 +1,95 @@
+"""Decide whether, and for how long, search results are cached.
+
+Results are worth caching when they are expensive to compute, or cheap but
+requested often enough for the Elasticsearch time saved to add up. Request
+frequencies are estimated per worker with a count-min sketch, which takes a
+fixed amount of memory whatever the number of distinct searches.
+"""
+
+from datetime import timedelta
+from functools import lru_cache
+from hashlib import blake2b
+
+from app.config import settings
+from app.utils.cache import CacheTimeToLive
+
+
+class CountMinSketch:
+    """Approximate counter of keys, which may overestimate but never
+    underestimate a count.
+
+    Counts are halved every `window` additions, so that the sketch tracks
+    recent popularity and its error does not grow indefinitely.
+    """
+
+    def __init__(self, width: int, depth: int, window: int):
+        self.width = width
+        self.depth = depth
+        self.window = window
+        self.counters = [[0] * width for _ in range(depth)]
+        self.additions = 0
+
+    def indexes(self, key: str) -> list[int]:
+        digest = blake2b(key.encode("utf-8"), digest_size=4 * self.depth).digest()
+        return [
+            int.from_bytes(digest[4 * row : 4 * row + 4], "little") % self.width
+            for row in range(self.depth)
+        ]
+
+    def add(self, key: str) -> int:
+        """Count the key once more, and return its estimated count."""
+        self.additions += 1
+        if self.additions >= self.window:
+            self.age()
+        estimate = None
+        for row, index in zip(self.counters, self.indexes(key)):
+            row[index] += 1
+            estimate = row[index] if estimate is None else min(estimate, row[index])
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self.counters, self.indexes(key)))
+
+    def age(self):
+        self.counters = [[count >> 1 for count in row] for row in self.counters]
+        self.additions = 0
+
+
+def get_search_time_to_live(
+    execution_time: int, requests: int, is_lookup: bool
+) -> timedelta | CacheTimeToLive:
+    """Time to live of search results, from their Elasticsearch execution time
+    (ms) and the estimated number of recent requests for them.
+
+    - slow searches are cached for a day, then served stale while refreshed
+    - SIREN/SIRET lookups are cached for a short while
+    - other searches are cached if `requests * execution_time`, the
+      Elasticsearch time caching them would have saved, is high enough, and
+      their results are not too large once encoded for the cache
+    """
+    policy = settings.cache_policy
+    if execution_time > policy.slow_search_time:
+        return CacheTimeToLive(
+            fresh=timedelta(seconds=policy.slow_search_time_to_live),
+            stale=timedelta(seconds=settings.cache.stale_time_to_live),
+        )
+    if is_lookup:
+        return timedelta(seconds=policy.lookup_time_to_live)
+
+    saved_time = requests * execution_time
+    if saved_time < policy.popular_min_saved_time:
+        return timedelta(0)
+    if saved_time < policy.hot_min_saved_time:
+        time_to_live = timedelta(seconds=policy.popular_time_to_live)
+    else:
+        time_to_live = timedelta(seconds=policy.hot_time_to_live)
+    return CacheTimeToLive(time_to_live, max_size=policy.max_payload_size)
+
+
+@lru_cache
+def get_request_sketch() -> CountMinSketch:
+    return CountMinSketch(
+        width=settings.cache_policy.sketch_width,
+        depth=settings.cache_policy.sketch_depth,
+        window=settings.cache_policy.sketch_window,
+    )
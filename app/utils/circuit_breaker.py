@@ -0,0 +1,81 @@
+import logging
+import time
+from enum import Enum
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling a failing dependency for a cool-down period.
+
+    The circuit opens after `failure_threshold` consecutive failures, and calls
+    are skipped while it is open. Once the cool-down is over, the circuit is
+    half open : a single call is let through as a probe, closing the circuit if
+    it succeeds and opening it again if it fails. A probe which never reports
+    back (e.g. cancelled) is given up on after another cool-down.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, cool_down: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cool_down = cool_down
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.probe_started_at: float | None = None
+        self.times_opened = 0
+        self.skipped_calls = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self.opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self.opened_at < self.cool_down:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    def allow_call(self) -> bool:
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        now = time.monotonic()
+        probe_is_running = (
+            self.probe_started_at is not None
+            and now - self.probe_started_at < self.cool_down
+        )
+        if state == CircuitState.HALF_OPEN and not probe_is_running:
+            self.probe_started_at = now
+            return True
+        self.skipped_calls += 1
+        return False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logging.warning(f"Circuit breaker {self.name} closed")
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.probe_started_at = None
+        if self.opened_at is None:
+            if self.consecutive_failures < self.failure_threshold:
+                return
+            self.times_opened += 1
+            logging.warning(
+                f"Circuit breaker {self.name} opened after "
+                f"{self.consecutive_failures} consecutive failures"
+            )
+        self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "skipped_calls": self.skipped_calls,
+        }
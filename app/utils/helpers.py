@@ -3,22 +3,9 @@ import logging
 from datetime import datetime
 from hashlib import sha256
 
-import requests
-
 from app.config import settings
 
 
-def fetch_json_from_url(url):
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        json_content = response.json()
-        return json_content
-    except requests.RequestException as e:
-        # Handle exceptions (e.g., network issues, invalid JSON, etc.)
-        raise RuntimeError(f"Error fetching JSON from {url}: {str(e)}")
-
-
 def convert_to_year_month(date_string):
     try:
         date_object = datetime.strptime(date_string, "%d/%m/%Y")
@@ -158,3 +145,11 @@ def convert_date_to_iso(date_str):
     except ValueError:
         # Handle incorrect date format
         return None
+
+
+def convert_to_int(value):
+    return None if value is None else int(value)
+
+
+def convert_to_float(value):
+    return None if value is None else float(value)
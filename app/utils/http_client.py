@@ -0,0 +1,67 @@
+from functools import lru_cache
+
+import httpx
+import orjson
+
+from app.config import settings
+
+
+@lru_cache
+def get_http_client() -> httpx.AsyncClient:
+    """Process-wide async HTTP client for the metadata files, created on first
+    use. Its connections are kept open between requests."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            settings.metadata.timeout, connect=settings.metadata.connect_timeout
+        ),
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+    )
+
+
+async def close_http_client():
+    await get_http_client().aclose()
+
+
+class JsonResource:
+    """JSON file served over HTTP, revalidated once fetched.
+
+    The last version fetched is kept with its `ETag` and `Last-Modified`
+    headers : later fetches are conditional, and get a `304 Not Modified`
+    without body when the file did not change, which is then neither
+    downloaded nor parsed again.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.value = None
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+
+    def build_conditional_headers(self) -> dict:
+        headers = {}
+        if self.value is None:
+            return headers
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    async def fetch(self, client: httpx.AsyncClient | None = None):
+        """Fetch the file, or return its last version if it did not change."""
+        client = client or get_http_client()
+        try:
+            response = await client.get(
+                self.url, headers=self.build_conditional_headers()
+            )
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                if self.value is not None:
+                    return self.value
+            response.raise_for_status()
+            value = orjson.loads(response.content)
+        except (httpx.HTTPError, orjson.JSONDecodeError) as error:
+            raise RuntimeError(f"Error fetching JSON from {self.url}: {error}")
+        self.value = value
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        return value
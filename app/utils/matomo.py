@@ -4,8 +4,10 @@ import logging
 import random
 import secrets
 import urllib
+from collections import deque
+from functools import lru_cache
 
-import requests
+import httpx
 from fastapi import Request
 
 from app.config import settings
@@ -14,43 +16,139 @@ from app.config import settings
 TRACKING_PROBABILITY = 1 / 100
 
 
-async def track_api_call_via_matomo(request, timeout=5):
+class MatomoTracker:
+    """Send tracked API calls to Matomo in the background.
+
+    Events are queued in memory and sent by a background task, several at a
+    time, with Matomo's bulk tracking API : tracking never delays the response.
+    The queue is bounded, when it is full the oldest events are dropped.
     """
-    Track an API call via Matomo.
 
-    Args:
-        request: The web request object.
+    def __init__(
+        self,
+        tracking_url: str,
+        max_queue_size: int,
+        bulk_max_size: int,
+        flush_interval: float,
+        timeout: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        # Bulk requests are posted to the tracking endpoint, without query
+        self.bulk_url = tracking_url.split("?")[0]
+        self.bulk_max_size = bulk_max_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.transport = transport
+        self.events: deque[str] = deque(maxlen=max_queue_size)
+        self.task: asyncio.Task | None = None
+        self.new_event: asyncio.Event | None = None
+        self.sent_events = 0
+        self.dropped_events = 0
+        self.failed_events = 0
+
+    def track(self, tracking_params: dict):
+        """Queue an event, without waiting for it to be sent."""
+        if len(self.events) == self.events.maxlen:
+            self.dropped_events += 1
+        self.events.append("?" + urllib.parse.urlencode(tracking_params))
+        self.start()
+        self.new_event.set()
+
+    def start(self):
+        """Start the background task on the running event loop, if needed."""
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.task.get_loop() is not loop:
+            self.new_event = asyncio.Event()
+            self.task = loop.create_task(self.send_events_forever())
+
+    async def send_events_forever(self):
+        # The client keeps its connections to Matomo open between bulk requests
+        async with self.build_client() as client:
+            while True:
+                if not self.events:
+                    self.new_event.clear()
+                    await self.new_event.wait()
+                # Let a few more events be queued, to send them together
+                if len(self.events) < self.bulk_max_size:
+                    await asyncio.sleep(self.flush_interval)
+                await self.send_events(client)
+
+    def build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=self.timeout, transport=self.transport)
+
+    async def send_events(self, client: httpx.AsyncClient) -> bool:
+        """Send at most `bulk_max_size` queued events in a bulk request, and
+        return whether it succeeded."""
+        events = [
+            self.events.popleft()
+            for _ in range(min(len(self.events), self.bulk_max_size))
+        ]
+        if not events:
+            return True
+        try:
+            response = await client.post(self.bulk_url, json={"requests": events})
+            response.raise_for_status()
+        except httpx.HTTPError as error:
+            self.failed_events += len(events)
+            logging.info(f"Matomo logging failed: {error}")
+            return False
+        self.sent_events += len(events)
+        return True
+
+    async def close(self):
+        """Stop the background task, then send the queued events, unless Matomo
+        fails."""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except (asyncio.CancelledError, RuntimeError):
+                # The task may belong to an event loop which is already closed
+                pass
+            self.task = None
+        if not self.events:
+            return
+        async with self.build_client() as client:
+            while self.events and await self.send_events(client):
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "queued_events": len(self.events),
+            "sent_events": self.sent_events,
+            "dropped_events": self.dropped_events,
+            "failed_events": self.failed_events,
+        }
+
 
-    Raises:
-        Exception: If Matomo logging fails, an exception is caught and logged.
+@lru_cache
+def get_matomo_tracker() -> MatomoTracker:
+    return MatomoTracker(
+        tracking_url=str(settings.matomo.tracking_url),
+        max_queue_size=settings.matomo.max_queue_size,
+        bulk_max_size=settings.matomo.bulk_max_size,
+        flush_interval=settings.matomo.flush_interval,
+        timeout=settings.matomo.timeout,
+    )
 
-    Notes:
-        This function tracks the API call with Matomo using
-        the provided request information, and the data is sent asynchronously.
 
-    """
-    try:
-        rec = 1  # Required for tracking
-        relative_url = request.url.path + "?" + request.url.query
-        url = f"https://recherche-entreprises.api.gouv.fr{str(relative_url)}"
-        action_name = "Recherche API"
-        _id = generate_unique_visitor_id(request)
-
-        tracking_params = {
-            "idsite": settings.matomo.id_site,
-            "rec": rec,
-            "action_name": action_name,
-            "url": url,
-            "uid": _id,
-            "_id": _id,
-            "apiv": 1,
-        }
+def build_tracking_params(request: Request) -> dict:
+    """Matomo tracking parameters of an API call."""
+    rec = 1  # Required for tracking
+    relative_url = request.url.path + "?" + request.url.query
+    url = f"https://recherche-entreprises.api.gouv.fr{str(relative_url)}"
+    action_name = "Recherche API"
+    _id = generate_unique_visitor_id(request)
 
-        tracking_data = urllib.parse.urlencode(tracking_params)
-        tracking_url = str(settings.matomo.tracking_url) + tracking_data
-        await requests.get(tracking_url, timeout=timeout)
-    except Exception as error:
-        logging.info(f"Matomo logging failed: {error}")
+    return {
+        "idsite": settings.matomo.id_site,
+        "rec": rec,
+        "action_name": action_name,
+        "url": url,
+        "uid": _id,
+        "_id": _id,
+        "apiv": 1,
+    }
 
 
 def generate_unique_visitor_id(request: Request):
@@ -77,7 +175,7 @@ def generate_unique_visitor_id(request: Request):
 
     hashed_id = hashlib.sha256(unique_id.encode("utf-8")).hexdigest()[:16]
 
-    logging.info(
+    logging.debug(
         f"hashed_id: {hashed_id} - unique_id : {unique_id} - X-Real-Ip: {real_ip} "
         f"- X-Forwarded-For : {forwarded_for} - User-Agent : {user_agent}"
     )
@@ -91,5 +189,7 @@ def track_event(request: Request):
     """
     random_number = random.random()
     if random_number < TRACKING_PROBABILITY:
-        loop = asyncio.get_event_loop()
-        return loop.create_task(track_api_call_via_matomo(request))
+        try:
+            get_matomo_tracker().track(build_tracking_params(request))
+        except Exception as error:
+            logging.info(f"Matomo logging failed: {error}")
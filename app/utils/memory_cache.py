@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
+
+from app.config import settings
+
+
+class MemoryCache:
+    """Per-worker LRU cache, bounded both in number of entries and in size.
+
+    Entries expire after their own time to live. The size of an entry is the
+    length of its serialized payload, which is an approximation of its memory
+    footprint. Cached values are shared between requests and must be treated as
+    read-only by callers.
+    """
+
+    def __init__(self, max_entries: int, max_size: int, max_time_to_live: timedelta):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.max_time_to_live = max_time_to_live
+        # key -> (expiration time, size, value), least recently used first
+        self.entries: OrderedDict[str, tuple[float, int, object]] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, time_to_live: timedelta, size: int):
+        time_to_live = min(time_to_live, self.max_time_to_live)
+        if time_to_live <= timedelta(0) or size > self.max_size:
+            return
+        self.delete(key)
+        expires_at = time.monotonic() + time_to_live.total_seconds()
+        self.entries[key] = (expires_at, size, value)
+        self.size += size
+        while len(self.entries) > self.max_entries or self.size > self.max_size:
+            _, (_, evicted_size, _) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self.entries),
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+@lru_cache
+def get_memory_cache() -> MemoryCache:
+    return MemoryCache(
+        max_entries=settings.cache.memory_max_entries,
+        max_size=settings.cache.memory_max_size,
+        max_time_to_live=timedelta(seconds=settings.cache.memory_max_time_to_live),
+    )
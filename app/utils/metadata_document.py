@@ -0,0 +1,138 @@
+import asyncio
+import gzip
+import logging
+import time
+from hashlib import sha256
+
+import orjson
+from fastapi import Request, Response, status
+
+from app.exceptions.exceptions import ServiceUnavailableError
+from app.utils.http_client import JsonResource
+
+UNAVAILABLE_MESSAGE = (
+    "Ce document n'est pas disponible pour le moment. Veuillez réessayer plus tard."
+)
+
+
+class MetadataDocument:
+    """JSON document served as is from a remote file, refreshed in the
+    background.
+
+    Each worker holds the last good version of the document, encoded once per
+    version, with its gzipped version and a strong `ETag` for each of them :
+    responses are served from these bytes, without parsing nor encoding. When
+    the remote file can not be fetched, the last good version keeps being
+    served. Without any, requests fail straight away for `retry_interval` after
+    a failed fetch, instead of each waiting for another one.
+    """
+
+    def __init__(
+        self, name: str, url: str, refresh_interval: float, retry_interval: float
+    ):
+        self.name = name
+        self.resource = JsonResource(url)
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        # `time.monotonic()` of the last failed fetch, None if it succeeded
+        self.failed_at: float | None = None
+        self.value = None
+        self.body: bytes | None = None
+        self.gzipped_body: bytes | None = None
+        self.etag: str | None = None
+        self.gzipped_etag: str | None = None
+        self.lock = asyncio.Lock()
+        self.task: asyncio.Task | None = None
+
+    async def refresh(self):
+        """Fetch the document, and encode it if it changed. Errors are logged,
+        the last good version is kept."""
+        async with self.lock:
+            await self.fetch()
+
+    async def fetch(self):
+        try:
+            value = await self.resource.fetch()
+        except RuntimeError as error:
+            self.failed_at = time.monotonic()
+            logging.warning(f"Could not refresh {self.name}: {error}")
+            return
+        self.failed_at = None
+        # The resource returns the value it holds if the file did not change
+        if value is self.value:
+            return
+        body = orjson.dumps(value)
+        self.value = value
+        self.gzipped_body = gzip.compress(body)
+        digest = sha256(body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzipped_etag = f'"{digest}-gzip"'
+        self.body = body
+
+    def failed_recently(self) -> bool:
+        return (
+            self.failed_at is not None
+            and time.monotonic() - self.failed_at < self.retry_interval
+        )
+
+    async def load(self):
+        """Fetch the document if none is held, unless a fetch failed less than
+        `retry_interval` ago, e.g. while waiting for the lock."""
+        if self.failed_recently():
+            return
+        async with self.lock:
+            if self.body is None and not self.failed_recently():
+                await self.fetch()
+
+    async def refresh_forever(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """Start refreshing the document in the background."""
+        self.task = asyncio.get_running_loop().create_task(self.refresh_forever())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def get_response(self, request: Request) -> Response:
+        if self.body is None:
+            # Not fetched yet, or every fetch so far failed
+            await self.load()
+            if self.body is None:
+                raise ServiceUnavailableError(UNAVAILABLE_MESSAGE)
+        if accepts_gzip(request.headers.get("Accept-Encoding", "")):
+            body, etag = self.gzipped_body, self.gzipped_etag
+            headers = {"ETag": etag, "Content-Encoding": "gzip"}
+        else:
+            body, etag = self.body, self.etag
+            headers = {"ETag": etag}
+        headers["Vary"] = "Accept-Encoding"
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in (value.strip() for value in if_none_match.split(",")):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an `Accept-Encoding` header accepts gzip, explicitly or with
+    `*`, with a non-zero quality."""
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        quality = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
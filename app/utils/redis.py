@@ -1,9 +1,21 @@
-# from redis import asyncio as redis
 import logging
 
-import redis
+from redis import asyncio as redis
 
 from app.config import settings
+from app.utils.circuit_breaker import CircuitBreaker
+
+# Atomically delete a key only if it still holds the given value (e.g. a lock
+# that may have expired and been acquired by someone else)
+DELETE_IF_EQUAL_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Returned instead of a result when a command could not be run
+ERROR = object()
 
 
 class Singleton(type):
@@ -21,35 +33,98 @@ class RedisClient(metaclass=Singleton):
         port = settings.redis.port
         db = settings.redis.database
 
-        # Connecting to redis client
-        try:
-            self.server = redis.Redis(
-                host=host,
-                port=port,
-                db=db,
-                decode_responses=True,
-                health_check_interval=30,
-            )
-            ping = self.server.ping()
-            if not ping:
-                logging.error(f"**************Could not ping Redis: {ping}")
-        except redis.exceptions.RedisError as error:
-            logging.info(f"Redis error while connecting: {error}")
+        # Connections are opened lazily by the pool on the first command. When
+        # all of them are in use, commands wait for one up to `timeout`
+        connection_pool = redis.BlockingConnectionPool(
+            host=host,
+            port=port,
+            db=db,
+            max_connections=settings.redis.max_connections,
+            timeout=settings.redis.timeout,
+            socket_connect_timeout=settings.redis.connect_timeout,
+            socket_timeout=settings.redis.timeout,
+            health_check_interval=30,
+        )
+        # Cached values are binary, see `cache_codec`
+        self.server = redis.Redis(
+            connection_pool=connection_pool, decode_responses=False
+        )
+        # Once Redis is failing, requests skip it instead of waiting on it
+        self.circuit_breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=settings.redis.circuit_breaker_failures,
+            cool_down=settings.redis.circuit_breaker_cool_down,
+        )
 
-    def get(self, key):
+    async def execute(self, command, error_message, default=None):
+        """Run `command`, or return `default` if Redis fails or is skipped."""
+        if not self.circuit_breaker.allow_call():
+            return default
         try:
-            cached_value = self.server.get(key)
-            return cached_value
+            result = await command()
         except redis.RedisError as error:
-            logging.info(f"Error while getting value using key: {error}")
+            self.circuit_breaker.record_failure()
+            logging.info(f"{error_message}: {error}")
+            return default
+        self.circuit_breaker.record_success()
+        return result
+
+    async def get(self, key):
+        return await self.execute(
+            lambda: self.server.get(key), "Error while getting value using key"
+        )
+
+    async def get_with_time_to_live(self, key):
+        """Get a value and its remaining time to live (ms) in one round-trip."""
+
+        async def get_with_time_to_live():
+            async with self.server.pipeline(transaction=False) as pipeline:
+                pipeline.get(key)
+                pipeline.pttl(key)
+                cached_value, time_to_live = await pipeline.execute()
+            return cached_value, time_to_live
+
+        return await self.execute(
+            get_with_time_to_live,
+            "Error while getting value using key",
+            default=(None, None),
+        )
 
-    def set(
+    async def set(
         self,
         key,
         value,
         expire,
     ):
-        try:
-            self.server.set(key, value, ex=expire)
-        except redis.RedisError as error:
-            logging.info(f"Error while saving value: {error}")
+        await self.execute(
+            lambda: self.server.set(key, value, ex=expire),
+            "Error while saving value",
+        )
+
+    async def set_if_absent(self, key, value, expire_ms):
+        """Returns whether the key was set, or None if Redis is unavailable."""
+        was_set = await self.execute(
+            lambda: self.server.set(key, value, px=expire_ms, nx=True),
+            "Error while saving value",
+            default=ERROR,
+        )
+        return None if was_set is ERROR else bool(was_set)
+
+    async def delete_if_equal(self, key, value):
+        await self.execute(
+            lambda: self.server.eval(DELETE_IF_EQUAL_SCRIPT, 1, key, value),
+            "Error while deleting value",
+        )
+
+    async def exists(self, key):
+        return bool(
+            await self.execute(
+                lambda: self.server.exists(key), "Error while checking key"
+            )
+        )
+
+    def stats(self) -> dict:
+        return self.circuit_breaker.stats()
+
+    async def close(self):
+        await self.server.aclose(close_connection_pool=True)
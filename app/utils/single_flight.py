@@ -0,0 +1,62 @@
+import asyncio
+import secrets
+import time
+from collections.abc import Awaitable, Callable
+
+from app.config import settings
+
+
+class SingleFlight:
+    """Coalesce concurrent calls sharing the same key into a single execution.
+
+    The first caller runs `get_value`, the others wait for its result (or its
+    exception). The execution is shielded so that a cancelled caller, e.g. a
+    client disconnecting, does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.calls: dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, get_value: Callable[[], Awaitable]):
+        call = self.calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(get_value())
+            self.calls[key] = call
+            call.add_done_callback(lambda _: self.calls.pop(key, None))
+        return await asyncio.shield(call)
+
+
+async def run_with_redis_lock(
+    redis_client,
+    key: str,
+    get_value: Callable[[], Awaitable],
+    get_cached_value: Callable[[], Awaitable],
+):
+    """Coalesce calls across workers with a Redis lock on `key`.
+
+    The worker holding the lock runs `get_value`, which is expected to store its
+    result in the cache. The others poll the cache until the value shows up or
+    the lock is released, and only run `get_value` themselves if the value is
+    still missing (not cacheable, or the lease expired).
+    """
+    lock_key = f"lock:{key}"
+    token = secrets.token_hex(8)
+    lease = settings.cache.lock_lease
+    acquired = await redis_client.set_if_absent(lock_key, token, lease)
+    # Without Redis, there is nothing to coordinate with
+    if acquired is None or acquired:
+        try:
+            return await get_value()
+        finally:
+            if acquired:
+                await redis_client.delete_if_equal(lock_key, token)
+
+    deadline = time.monotonic() + lease / 1000
+    while time.monotonic() < deadline:
+        await asyncio.sleep(settings.cache.lock_poll_interval / 1000)
+        cached_value = await get_cached_value()
+        if cached_value:
+            return cached_value
+        if not await redis_client.exists(lock_key):
+            break
+    return await get_value()